@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""calculate_multiple_items(스칼라) 경로와 calculate_catalog(벡터화) 경로 비교 벤치마크"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datagen import make_catalog
+from probability_converter import ProbabilityConverter
+
+
+def run_scalar(converter, catalog):
+    results = {}
+    for group_id, group in catalog.groupby("group_id", sort=False):
+        items = dict(zip(group["item_id"].tolist(), group["item_percentage"].tolist()))
+        results.update(converter.calculate_multiple_items(int(group["group_total"].iat[0]), items))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=10000)
+    parser.add_argument("--items-per-group", type=int, default=100)
+    args = parser.parse_args()
+
+    converter = ProbabilityConverter()
+    catalog = make_catalog(args.groups, args.items_per_group)
+    n = len(catalog)
+
+    start = time.perf_counter()
+    scalar = run_scalar(converter, catalog)
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = converter.calculate_catalog(catalog)
+    batch_seconds = time.perf_counter() - start
+
+    expected = np.array([scalar[item_id] for item_id in batch["item_id"].tolist()], dtype=np.int64)
+    mismatches = int(np.count_nonzero(expected != batch["item_probability"].to_numpy()))
+
+    print(f"아이템 수: {n:,}")
+    print(f"스칼라:   {scalar_seconds:.3f}s ({n / scalar_seconds:,.0f} items/s)")
+    print(f"벡터화:   {batch_seconds:.3f}s ({n / batch_seconds:,.0f} items/s)")
+    print(f"속도 향상: {scalar_seconds / batch_seconds:.1f}x, 불일치: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""코어 모듈 import 시간 벤치마크 (모듈마다 새 프로세스에서 측정)"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "probability_converter",
+    "drop_table_compiler",
+    "probability_result_model",
+    "drop_sampler",
+    "worktime_calculator",
+    "worktime_storage",
+    "worktime_batch",
+    "probability_converter_streamlit",
+    "worktime_calculator_streamlit",
+]
+HEAVY_MODULES = ["numpy", "pandas", "plotly", "pyarrow", "streamlit"]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(module, repeat):
+    timings = []
+    loaded = ""
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ""
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    print(f"{'모듈':<34}{'import (ms)':>12}  무거운 의존성")
+    for module in args.modules:
+        seconds, loaded = measure(module, args.repeat)
+        print(f"{module:<34}{seconds * 1000:>12.1f}  {loaded or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""벤치마크용 합성 데이터 생성 (시드 고정으로 재현 가능)"""
+import json
+import random
+import sqlite3
+from contextlib import closing
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def make_items(n_items, seed=0):
+    """합이 100%인 {아이템_id: 그룹내_확률(백분율)} 드랍 테이블"""
+    rng = np.random.default_rng(seed)
+    weights = rng.random(n_items)
+    percentages = np.round(weights / weights.sum() * 100, 6)
+    percentages[-1] = round(100 - percentages[:-1].sum(), 6)
+    return {f"item_{i}": float(percentage) for i, percentage in enumerate(percentages)}
+
+
+def make_catalog(n_groups, items_per_group, seed=0):
+    """calculate_catalog 입력 형식의 여러 그룹 카탈로그"""
+    rng = np.random.default_rng(seed)
+    group_totals = rng.integers(1, 1000000000, size=n_groups)
+    weights = rng.random((n_groups, items_per_group))
+    percentages = np.round(weights / weights.sum(axis=1, keepdims=True) * 100, 4)
+    return pd.DataFrame({
+        "group_id": np.repeat(np.arange(n_groups), items_per_group),
+        "group_total": np.repeat(group_totals, items_per_group),
+        "item_id": np.arange(n_groups * items_per_group),
+        "item_percentage": percentages.ravel(),
+    })
+
+
+def make_punches(n, seed=0):
+    """("HH:MM" 출근, "HH:MM" 퇴근) 목록 (퇴근 시간 일부는 빈 값)"""
+    rng = random.Random(seed)
+    return [
+        (f"{rng.randint(7, 10)}:{rng.randint(0, 59):02d}",
+         rng.choice(["", f"{rng.randint(17, 21)}:{rng.randint(0, 59):02d}"]))
+        for _ in range(n)
+    ]
+
+
+def make_week(rng, days=('월요일', '화요일', '수요일', '목요일', '금요일')):
+    return {
+        day: {"start": f"{rng.randint(8, 10)}:{rng.randint(0, 59):02d}",
+              "end": f"{rng.randint(17, 20)}:{rng.randint(0, 59):02d}"}
+        for day in days
+    }
+
+
+def make_history(n_users, n_weeks, seed=0):
+    """{사용자: {주차_키: 한 주 데이터}} 형식의 여러 해 주간 기록"""
+    rng = random.Random(seed)
+    first_monday = date(2020, 1, 6)
+    return {
+        f"user_{u}": {
+            (first_monday + timedelta(weeks=w)).isoformat(): make_week(rng)
+            for w in range(n_weeks)
+        }
+        for u in range(n_users)
+    }
+
+
+def write_json_history(storage, history):
+    """make_history 결과를 JsonWorkTimeStorage 파일로 한 번에 기록 (save()를 주마다 부르면 파일 재작성이 반복됨)"""
+    for username, weeks in history.items():
+        with open(storage.get_user_data_file(username), 'w', encoding='utf-8') as f:
+            json.dump(weeks, f, ensure_ascii=False, indent=2)
+
+
+def write_sqlite_history(storage, history):
+    """make_history 결과를 SqliteWorkTimeStorage DB에 한 트랜잭션으로 기록"""
+    with closing(sqlite3.connect(storage.db_path)) as conn, conn:
+        conn.executemany(
+            "INSERT INTO worktime (username, week, data) VALUES (?, ?, ?)",
+            [(username, week, json.dumps(work_times, ensure_ascii=False))
+             for username, weeks in history.items() for week, work_times in weeks.items()],
+        )
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크 스위트: 확률 변환, 드랍 추첨, 근무시간 계산, 근무시간 저장소 I/O
+
+    python benchmarks/suite.py --size medium --output results.json
+    python benchmarks/suite.py --size medium --compare results.json --threshold 0.1
+
+각 항목의 ops/sec, 호출당 지연시간 p50/p99, 최대 메모리(tracemalloc)를 측정해 JSON으로 저장하며,
+--compare로 이전 결과를 주면 ops/sec가 threshold 이상 떨어진 항목을 회귀로 보고하고 종료 코드 1을 반환합니다.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from datagen import make_history, make_items, make_punches, make_week, write_json_history, write_sqlite_history
+from drop_rebalancer import DropRebalancer
+from drop_sampler import DropSampler
+from drop_table_compiler import DropTableCompiler
+from probability_converter import ProbabilityConverter
+from worktime_calculator import WorkTimeCalculator
+from worktime_storage import CachedWorkTimeStorage, JsonWorkTimeStorage, SqliteWorkTimeStorage
+
+# 크기별 설정: 드랍 테이블 아이템 수, 근무 기록(사용자 수, 주 수), 출퇴근 기록 수
+SIZES = {
+    "small": {"items": 1000, "users": 10, "weeks": 52, "punches": 10000},
+    "medium": {"items": 100000, "users": 50, "weeks": 260, "punches": 100000},
+    "large": {"items": 1000000, "users": 200, "weeks": 520, "punches": 1000000},
+}
+
+
+class Case:
+    """
+    벤치마크 항목
+
+    Args:
+        name (str): 항목 이름 (결과 비교 키)
+        func (callable): 측정할 함수 (인자 없음)
+        ops (int): func 한 번 호출이 처리하는 작업 수 (ops/sec 계산용)
+    """
+
+    def __init__(self, name, func, ops=1):
+        self.name = name
+        self.func = func
+        self.ops = ops
+
+
+def build_cases(size, workdir):
+    config = SIZES[size]
+    converter = ProbabilityConverter()
+    compiler = DropTableCompiler(converter.MAX_PROBABILITY)
+    items = make_items(config["items"])
+    percentages = list(items.values())
+    parts = converter.calculate_multiple_items(500000000, items)
+    sampler = DropSampler(parts, converter.MAX_PROBABILITY, seed=0)
+    rebalancer = DropRebalancer(converter)
+    rebalance_catalog = pd.DataFrame({
+        "group_id": 0,
+        "group_total": 500000000,
+        "item_id": list(items),
+        "item_percentage": percentages,
+        "target_probability": np.where(np.arange(len(items)) % 100 == 0, 10000.0, np.nan),
+    })
+
+    calculator = WorkTimeCalculator()
+    punches = make_punches(config["punches"])
+    starts = [start for start, _ in punches]
+    ends = [end for _, end in punches]
+
+    history = make_history(config["users"], config["weeks"])
+    json_storage = JsonWorkTimeStorage(workdir)
+    sqlite_storage = SqliteWorkTimeStorage(os.path.join(workdir, "worktime.db"))
+    write_json_history(json_storage, history)
+    write_sqlite_history(sqlite_storage, history)
+    cached_storage = CachedWorkTimeStorage(sqlite_storage)
+    username = next(iter(history))
+    last_week = max(history[username])
+    week = make_week(random.Random(0))
+
+    return [
+        Case("converter.calculate_multiple_items", lambda: converter.calculate_multiple_items(500000000, items),
+             len(items)),
+        Case("converter.calculate_batch", lambda: converter.calculate_batch(500000000, percentages), len(items)),
+        Case("compiler.calculate_multiple_items", lambda: compiler.calculate_multiple_items(500000000, items),
+             len(items)),
+        Case("rebalancer.solve", lambda: rebalancer.solve(rebalance_catalog), len(items)),
+        Case("sampler.build", lambda: DropSampler(parts, converter.MAX_PROBABILITY), len(parts)),
+        Case("sampler.draw", lambda: [sampler.draw() for _ in range(10000)], 10000),
+        Case("sampler.draw_indices", lambda: sampler.draw_indices(1000000), 1000000),
+        Case("sampler.draw_many", lambda: sampler.draw_many(1000000), 1000000),
+        Case("worktime.calculate_day_minutes",
+             lambda: [calculator.calculate_day_minutes(start, end) for start, end in punches], len(punches)),
+        Case("worktime.calculate_day_minutes_batch",
+             lambda: calculator.calculate_day_minutes_batch(starts, ends), len(punches)),
+        Case("storage.json.load", lambda: json_storage.load(username)),
+        Case("storage.json.save", lambda: json_storage.save(username, last_week, week)),
+        Case("storage.sqlite.load", lambda: sqlite_storage.load(username)),
+        Case("storage.sqlite.save", lambda: sqlite_storage.save(username, last_week, week)),
+        Case("storage.cached.load", lambda: cached_storage.load(username)),
+        Case("storage.cached.weeks", lambda: cached_storage.week_index(username).latest()),
+    ]
+
+
+def run_case(case, min_time, max_calls):
+    """case를 min_time초 이상(최대 max_calls회) 반복 측정"""
+    case.func()  # 워밍업 (캐시, lazy import 등)
+
+    latencies = []
+    total_start = time.perf_counter()
+    while len(latencies) < max_calls and (time.perf_counter() - total_start < min_time or len(latencies) < 3):
+        start = time.perf_counter()
+        case.func()
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+
+    tracemalloc.start()
+    case.func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p99 = percentiles[49], percentiles[98]
+    else:
+        p50 = p99 = latencies[0]
+    return {
+        "calls": len(latencies),
+        "ops_per_call": case.ops,
+        "ops_per_sec": case.ops * len(latencies) / total,
+        "p50_ms": p50 * 1000,
+        "p99_ms": p99 * 1000,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """ops/sec가 baseline보다 threshold 비율 이상 떨어진 항목 목록을 반환"""
+    regressions = []
+    print(f"\n{'항목':<40}{'이전 ops/s':>14}{'현재 ops/s':>14}{'변화':>9}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = result["ops_per_sec"] / previous["ops_per_sec"] - 1
+        regressed = change < -threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<40}{previous['ops_per_sec']:>14,.0f}{result['ops_per_sec']:>14,.0f}"
+              f"{change:>+8.1%}{' ⚠️' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 스위트")
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--min-time", type=float, default=1.0, help="항목당 최소 측정 시간(초)")
+    parser.add_argument("--max-calls", type=int, default=1000, help="항목당 최대 호출 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀로 판단할 ops/sec 감소 비율")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = [case for case in build_cases(args.size, workdir) if args.filter in case.name]
+        print(f"{'항목':<40}{'ops/s':>14}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>12}")
+        for case in cases:
+            result = run_case(case, args.min_time, args.max_calls)
+            results[case.name] = result
+            print(f"{case.name:<40}{result['ops_per_sec']:>14,.0f}{result['p50_ms']:>10.3f}"
+                  f"{result['p99_ms']:>10.3f}{result['peak_memory_kb']:>12,.0f}")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "size": args.size,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("size") != args.size:
+            print(f"경고: 비교 대상의 크기({baseline['meta'].get('size')})가 현재({args.size})와 다릅니다.")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+from drop_table_compiler import DropTableCompiler
+
+# 배율 이분 탐색 범위 (자연로그, e^±80)
+LOG_SCALE_RANGE = 80.0
+
+
+class DropRebalancer:
+    """
+    목표 전체 확률에 맞춰 그룹 내 확률을 다시 배분하는 what-if 솔버
+
+    그룹마다 고정 아이템을 뺀 나머지 확률을 다음 순서로 나눕니다.
+
+    1. 목표가 있는 아이템은 목표 전체 확률을 (최소/최대 범위로 잘라) 그대로 사용하고,
+       목표가 없는 아이템은 현재 비율을 유지한 채 같은 배율로 늘리거나 줄여 남은 확률을 채움
+    2. 1로 채울 수 없는 그룹(목표 합계가 너무 크거나 작음)은 목표가 없는 아이템을 하한/상한에 두고
+       목표가 있는 아이템을 같은 배율로 줄이거나 늘림
+
+    배율은 모든 그룹을 한 번에 이분 탐색하므로 반복마다 전체 아이템에 대한 벡터 연산 몇 번이면 되며,
+    마지막으로 최대 나머지 방식으로 정수 배분해 그룹마다 전체 확률의 합이 그룹 전체 확률과 정확히 일치합니다.
+
+    현재 확률과 고정 아이템 확률은 앱의 결과 표와 같은 방식(합이 100%인 그룹은 DropTableCompiler 정수 배분,
+    아니면 calculate_batch 절사)으로 계산하므로, 목표와 범위 없이 풀면 아무 아이템도 바뀌지 않습니다.
+    """
+
+    def __init__(self, converter, iterations=100):
+        """
+        Args:
+            converter (ProbabilityConverter): 스케일과 현재 확률 계산에 사용할 변환기
+            iterations (int): 배율 이분 탐색 반복 횟수
+        """
+        self.converter = converter
+        self.compiler = DropTableCompiler(converter.MAX_PROBABILITY)
+        self.iterations = iterations
+        self.infeasible_groups = []
+
+    def solve(self, catalog, group_totals=None):
+        """
+        Args:
+            catalog (pd.DataFrame | dict): calculate_catalog 입력 컬럼(group_id, group_total, item_id,
+                item_percentage)과 선택 컬럼을 가진 카탈로그
+                - target_probability: 목표 전체 확률 (설정된 스케일, NaN이면 목표 없음)
+                - fixed: True이면 그룹 내 확률을 바꾸지 않음
+                - min_probability / max_probability: 전체 확률 하한/상한 (설정된 스케일, NaN이면 제한 없음)
+            group_totals (dict): {그룹_id: 새 그룹 전체 확률}. 없는 그룹은 현재 group_total을 유지합니다.
+
+        Returns:
+            pd.DataFrame: calculate_catalog 결과(item_probability는 결과 표와 같은 현재 확률)에
+                new_group_total, new_probability(설정된 스케일, 정수), new_percentage(그룹 내 백분율,
+                바뀌지 않은 아이템은 원래 값), target_probability 컬럼을 추가한 결과
+                (범위 제약을 모두 만족할 수 없는 그룹은 infeasible_groups에 기록되며 합계가 그룹 전체 확률과 다를 수 있음)
+        """
+        df = catalog if isinstance(catalog, pd.DataFrame) else pd.DataFrame(catalog)
+        result = self.converter.calculate_catalog(df)
+
+        codes, group_ids = pd.factorize(result["group_id"], sort=False)
+        n_groups = len(group_ids)
+
+        def group_sum(values):
+            return np.bincount(codes, weights=values, minlength=n_groups)
+
+        current_totals = result["group_total"].to_numpy(dtype=np.int64)
+        totals = result["group_total"]
+        if group_totals:
+            totals = result["group_id"].map(group_totals).fillna(totals)
+        totals = totals.to_numpy(dtype=np.int64)
+        group_total = np.zeros(n_groups, dtype=np.int64)
+        group_total[codes] = totals
+
+        percentages = result["item_percentage"].to_numpy(dtype=np.float64)
+        weights = np.fromiter((self.compiler.to_fixed(percentage) for percentage in df["item_percentage"].tolist()),
+                              dtype=np.int64, count=len(df))
+        current_parts = self._table_parts(codes, n_groups, current_totals, percentages, weights)
+        # 그룹 전체 확률이 바뀌면 같은 그룹 내 확률로 새 전체 확률에서 다시 계산
+        table_parts = (self._table_parts(codes, n_groups, totals, percentages, weights)
+                       if group_totals else current_parts)
+        target = self._column(df, "target_probability", np.nan)
+        fixed = self._column(df, "fixed", False, dtype=bool)
+        upper = np.minimum(self._column(df, "max_probability", np.inf), totals)
+        lower = np.minimum(self._column(df, "min_probability", 0.0), upper)
+        bounded = ~np.isnan(self._column(df, "min_probability", np.nan)) | ~np.isnan(
+            self._column(df, "max_probability", np.nan))
+
+        # 고정 아이템은 새 그룹 전체 확률에서 같은 그룹 내 확률을 유지하고, 남은 확률(budget)을 나머지가 나눔
+        fixed_parts = np.where(fixed, table_parts, 0)
+        budget = group_total - group_sum(fixed_parts)
+
+        targeted = ~fixed & ~np.isnan(target)
+        free = ~fixed & ~targeted
+        target_parts = np.where(targeted, np.clip(np.nan_to_num(target), lower, upper), 0.0)
+        current = table_parts.astype(np.float64)
+        # 목표 없는 아이템이 모두 0%인 그룹은 남은 확률을 균등하게 나눔
+        free_current = group_sum(np.where(free, current, 0.0))
+        current = np.where(free & (free_current[codes] == 0), 1.0, current)
+
+        # 1단계: 목표는 그대로, 목표 없는 아이템이 나머지를 채움
+        free_budget = budget - group_sum(target_parts)
+        free_parts = self._fill(current, lower, upper, free, codes, free_budget)
+        feasible = np.abs(group_sum(free_parts) - free_budget) < 1
+        allocated = target_parts + free_parts
+
+        # 2단계: 목표 없는 아이템을 하한(목표가 넘칠 때) 또는 상한(모자랄 때)에 두고 목표를 같은 배율로 조정
+        if not feasible.all():
+            retry = ~feasible[codes]
+            too_large = (free_budget < group_sum(np.where(free, lower, 0.0)))[codes]
+            free_parts = np.where(free, np.where(too_large, lower, upper), 0.0)
+            target_budget = budget - group_sum(free_parts)
+            scaled = self._fill(np.where(targeted, np.nan_to_num(target), 0.0), lower, upper, targeted,
+                                codes, target_budget)
+            allocated = np.where(retry, scaled + free_parts, allocated)
+
+        # 목표/범위가 없고 그룹 전체 확률도 그대로인 그룹은 풀 것이 없으므로 현재 표를 유지
+        # (합이 100%가 아닌 그룹을 그룹 전체 확률에 맞춰 채우지 않음)
+        current_group_total = np.zeros(n_groups, dtype=np.int64)
+        current_group_total[codes] = current_totals
+        untouched = (group_sum(targeted | bounded) == 0) & (group_total == current_group_total)
+
+        allocated_sum = group_sum(allocated)
+        feasible = (np.abs(allocated_sum - budget) < 1) | untouched
+        self.infeasible_groups = group_ids[~feasible].tolist()
+        goal = np.where(feasible, budget, np.floor(allocated_sum)).astype(np.int64)
+
+        new_parts = self._apportion(allocated, codes, goal, upper, fixed) + fixed_parts
+        new_parts = np.where(untouched[codes], table_parts, new_parts)
+        new_weights = self._applied_weights(codes, n_groups, totals, weights, percentages, new_parts,
+                                            ~fixed & (new_parts != table_parts))
+        changed = new_weights != weights
+        new_percentages = np.where(changed, new_weights / self.compiler.weight_scale, percentages)
+
+        result["item_probability"] = current_parts
+        result["new_group_total"] = totals
+        # 새 그룹 내 확률을 적용했을 때 결과 표에 나올 값 (보정 후에도 남는 차이는 최대 나머지 배분의 ±1)
+        result["new_probability"] = self._table_parts(codes, n_groups, totals, new_percentages, new_weights)
+        # 바뀌지 않은 아이템은 그룹 내 확률도 원래 값을 유지 (적용할 때 불필요하게 바뀌지 않도록)
+        result["new_percentage"] = new_percentages
+        result["target_probability"] = target
+        return result
+
+    @staticmethod
+    def _column(df, name, default, dtype=np.float64):
+        """선택 컬럼을 배열로 (컬럼이 없거나 값이 비었으면 default)"""
+        if name not in df.columns:
+            return np.full(len(df), default, dtype=dtype)
+        return df[name].fillna(default).to_numpy(dtype=dtype)
+
+    def _table_parts(self, codes, n_groups, totals, percentages, weights):
+        """
+        결과 표와 같은 방식의 아이템별 전체 확률
+
+        그룹 내 확률 합이 100%인 그룹은 DropTableCompiler.apportion과 같은 최대 나머지 정수 배분
+        (정수 가중치 비율, 동률이면 먼저 나온 아이템 우선), 아니면 calculate_batch 절사 결과입니다.
+        """
+        weight_sum = np.bincount(codes, weights=weights, minlength=n_groups).astype(np.int64)
+        quotas, remainders = np.divmod(totals * weights, np.maximum(weight_sum, 1)[codes])
+        group_total = np.zeros(n_groups, dtype=np.int64)
+        group_total[codes] = totals
+        leftover = group_total - np.bincount(codes, weights=quotas, minlength=n_groups).astype(np.int64)
+        apportioned = quotas + (self._group_rank(codes, -remainders, n_groups) < leftover[codes])
+
+        exact = self._exact_groups(codes, n_groups, percentages) & (weight_sum > 0)
+        return np.where(exact[codes], apportioned, self.converter.calculate_batch(totals, percentages))
+
+    def _exact_groups(self, codes, n_groups, percentages):
+        """그룹 내 확률 합이 100%여서 결과 표가 정수 배분을 쓰는 그룹"""
+        percentage_sum = np.bincount(codes, weights=percentages, minlength=n_groups)
+        return np.array([self.converter.validate_percentages({"합계": total})[0] for total in percentage_sum],
+                        dtype=bool)
+
+    def _applied_weights(self, codes, n_groups, totals, weights, percentages, new_parts, adjustable):
+        """
+        adjustable 아이템의 정수 가중치(그룹 내 확률 x weight_scale)를 new_parts 비율로 정한 뒤,
+        결과 표와 같은 정수 배분으로 다시 계산했을 때 new_parts와 다른 아이템만 1단위씩 보정
+
+        그룹의 가중치 합을 그대로 두어(합이 100%가 아니던 그룹은 100%로) 나머지 아이템의 배분이 흔들리지 않게 합니다.
+        """
+        weight_sum = np.bincount(codes, weights=weights, minlength=n_groups).astype(np.int64)
+        weight_goal = np.where(self._exact_groups(codes, n_groups, percentages), weight_sum,
+                               self.compiler.weight_scale * 100)
+        share = new_parts * weight_goal[codes] / np.maximum(totals, 1)
+        new_weights = np.where(adjustable, np.floor(share), weights).astype(np.int64)
+        # 내림으로 모자란 가중치는 나머지가 큰 아이템부터 1씩 (DropTableCompiler.apportion과 같은 방식)
+        shortfall = weight_goal - np.bincount(codes, weights=new_weights, minlength=n_groups).astype(np.int64)
+        remainders = np.where(adjustable, share - np.floor(share), -1.0)
+        new_weights += adjustable & (self._group_rank(codes, -remainders, n_groups) < shortfall[codes])
+        for _ in range(self.iterations // 10):
+            applied = self._table_parts(codes, n_groups, totals, new_weights / self.compiler.weight_scale,
+                                        new_weights)
+            error = np.where(adjustable, applied - new_parts, 0)
+            if not error.any():
+                break
+            new_weights = np.maximum(new_weights - np.sign(error), 0)
+        return new_weights
+
+    @staticmethod
+    def _group_rank(codes, key, n_groups):
+        """그룹 안에서 key 오름차순 순위 (동률이면 입력 순서, 0부터)"""
+        order = np.lexsort((key, codes))
+        group_start = np.searchsorted(codes[order], np.arange(n_groups))
+        rank = np.empty(len(codes), dtype=np.int64)
+        rank[order] = np.arange(len(codes)) - group_start[codes[order]]
+        return rank
+
+    def _fill(self, desired, lower, upper, active, codes, budget):
+        """
+        active 아이템을 그룹마다 같은 배율 s로 늘리거나 줄여(clip(s * desired, lower, upper))
+        그룹 합계가 budget을 넘지 않는 범위에서 가장 가깝게 맞춤 (나머지 아이템은 0)
+        """
+        n_groups = len(budget)
+
+        def scaled(log_scale):
+            values = np.clip(desired * np.exp(log_scale)[codes], lower, upper)
+            return np.where(active, values, 0.0)
+
+        log_lo = np.full(n_groups, -LOG_SCALE_RANGE)
+        log_hi = np.full(n_groups, LOG_SCALE_RANGE)
+        for _ in range(self.iterations):
+            log_mid = (log_lo + log_hi) / 2
+            over = np.bincount(codes, weights=scaled(log_mid), minlength=n_groups) > budget
+            log_hi = np.where(over, log_mid, log_hi)
+            log_lo = np.where(over, log_lo, log_mid)
+        return scaled(log_lo)
+
+    @classmethod
+    def _apportion(cls, allocated, codes, goal, upper, fixed):
+        """그룹별로 내림한 뒤 모자란 만큼을 나머지가 큰 아이템부터 1씩 배분 (최대 나머지 방식)"""
+        n_groups = len(goal)
+        parts = np.floor(allocated).astype(np.int64)
+        shortfall = goal - np.bincount(codes, weights=parts, minlength=n_groups).astype(np.int64)
+
+        # 상한에 닿았거나 고정된 아이템은 후보에서 빼고(나머지 -1), 그룹 안에서 나머지 내림차순으로 순위를 매김
+        remainder = np.where(fixed | (parts + 1 > upper), -1.0, allocated - parts)
+        rank = cls._group_rank(codes, -remainder, n_groups)
+        parts += (rank < shortfall[codes]) & (remainder >= 0)
+        return parts
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import random
+
+import numpy as np
+
+
+class DropSampler:
+    """
+    ProbabilityConverter 결과({아이템_id: 전체_확률})로부터 O(1) 드랍 추첨기를 생성 (Vose 별칭 방법)
+
+    가중치를 정수 그대로 사용하므로 각 아이템이 뽑힐 확률은 parts / total_parts와 정확히 일치합니다.
+    테이블은 pickle로 직렬화할 수 있어 한 번 만들어 여러 프로세스에서 공유할 수 있습니다.
+    """
+
+    def __init__(self, item_parts, total_parts=None, seed=None):
+        """
+        Args:
+            item_parts (dict): {아이템_id: 전체_확률(설정된 스케일)} 형태
+            total_parts (int): 전체 확률 (예: MAX_PROBABILITY). 아이템 확률의 합보다 크면
+                남는 확률은 None(드랍 없음)으로 추첨됩니다. 생략하면 아이템 확률의 합을 사용합니다.
+            seed (int): 난수 시드
+        """
+        item_ids = list(item_parts)
+        weights = [int(item_parts[item_id]) for item_id in item_ids]
+        if any(weight < 0 for weight in weights):
+            raise ValueError("확률은 0 이상이어야 합니다.")
+
+        weight_sum = sum(weights)
+        if total_parts is not None:
+            if total_parts < weight_sum:
+                raise ValueError(f"아이템 확률의 합({weight_sum:,})이 전체 확률({total_parts:,})보다 큽니다.")
+            if total_parts > weight_sum:
+                item_ids.append(None)
+                weights.append(total_parts - weight_sum)
+                weight_sum = total_parts
+        if weight_sum <= 0:
+            raise ValueError("확률의 합은 0보다 커야 합니다.")
+
+        self.item_ids = item_ids
+        self.weights = weights
+        self.total_parts = weight_sum
+        self.threshold, self.alias = self._build_alias_table(weights, weight_sum)
+        # np.array(item_ids)는 ID 형식에 따라 dtype을 추론해 값이 바뀔 수 있으므로(1 -> '1', 튜플 -> 행) 객체 배열에 그대로 채움
+        self._items_array = np.empty(len(item_ids), dtype=object)
+        self._items_array[:] = item_ids
+        self._threshold_array = np.array(self.threshold, dtype=np.int64)
+        self._alias_array = np.array(self.alias, dtype=np.int64)
+        self._random = random.Random(seed)
+        self._rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def _build_alias_table(weights, weight_sum):
+        """
+        정수 별칭 테이블 생성
+
+        슬롯 i는 [0, weight_sum) 범위의 난수 u가 threshold[i]보다 작으면 i, 아니면 alias[i]를 반환합니다.
+        """
+        n = len(weights)
+        scaled = [weight * n for weight in weights]
+        threshold = [weight_sum] * n
+        alias = list(range(n))
+
+        small = [i for i in range(n) if scaled[i] < weight_sum]
+        large = [i for i in range(n) if scaled[i] >= weight_sum]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            threshold[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= weight_sum - scaled[less]
+            if scaled[more] < weight_sum:
+                small.append(more)
+            else:
+                large.append(more)
+        # 정수 연산이므로 남은 슬롯은 정확히 weight_sum (항상 자기 자신)
+        return threshold, alias
+
+    def draw(self):
+        """아이템 하나를 추첨"""
+        slot = self._random.randrange(len(self.threshold))
+        if self._random.randrange(self.total_parts) < self.threshold[slot]:
+            return self.item_ids[slot]
+        return self.item_ids[self.alias[slot]]
+
+    def draw_indices(self, n, rng=None):
+        """
+        n개를 추첨해 item_ids 기준 인덱스 배열(np.int64)로 반환
+
+        Args:
+            n (int): 추첨 횟수
+            rng (np.random.Generator): 사용할 난수 생성기 (기본값: 샘플러 내부 생성기)
+        """
+        rng = self._rng if rng is None else rng
+        slots = rng.integers(0, len(self.threshold), size=n)
+        rolls = rng.integers(0, self.total_parts, size=n)
+        return np.where(rolls < self._threshold_array[slots], slots, self._alias_array[slots])
+
+    def draw_many(self, n):
+        """n개를 추첨해 아이템 ID 배열로 반환"""
+        return self._items_array[self.draw_indices(n)]
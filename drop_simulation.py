@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+
+import numpy as np
+
+from drop_sampler import DropSampler
+
+# 워커 작업 하나가 담당하는 최대 추첨 횟수
+MAX_CHUNK_SIZE = 50000000
+# 프로세스당 작업 수 (작업 시간이 고르지 않아도 모든 프로세스가 끝까지 바쁘도록, 진행률도 이 단위로 갱신)
+CHUNKS_PER_WORKER = 4
+
+# 워커 프로세스마다 한 번만 전달받아 재사용하는 샘플러
+_worker_sampler = None
+
+
+def _init_worker(sampler):
+    global _worker_sampler
+    _worker_sampler = sampler
+
+
+def _simulate_chunk(seed_sequence, rolls, batch_size):
+    """워커: 독립 난수 스트림으로 rolls회 추첨한 뒤 아이템별 횟수(히스토그램)를 반환"""
+    rng = np.random.default_rng(seed_sequence)
+    n_items = len(_worker_sampler.item_ids)
+    counts = np.zeros(n_items, dtype=np.int64)
+    remaining = rolls
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        counts += np.bincount(_worker_sampler.draw_indices(size, rng), minlength=n_items)
+        remaining -= size
+    return rolls, counts
+
+
+class DropSimulator:
+    """
+    드랍 테이블 몬테카를로 검증기
+
+    여러 프로세스에서 독립 시드 스트림으로 추첨하고 히스토그램을 합친 뒤,
+    아이템별 관측 확률을 계산된 확률과 비교해 신뢰구간과 카이제곱 검정 결과를 보고합니다.
+    """
+
+    def __init__(self, item_parts, total_parts=None):
+        """
+        Args:
+            item_parts (dict): {아이템_id: 전체_확률(설정된 스케일)} 형태
+            total_parts (int): 전체 확률 (예: MAX_PROBABILITY). 남는 확률은 None(드랍 없음)으로 집계됩니다.
+        """
+        self.sampler = DropSampler(item_parts, total_parts)
+
+    def simulate(self, rolls, workers=None, chunk_size=None, batch_size=2000000, seed=None,
+                 on_progress=None):
+        """
+        rolls회 추첨해 아이템별 횟수를 반환
+
+        Args:
+            rolls (int): 전체 추첨 횟수
+            workers (int): 프로세스 수 (기본값: CPU 수)
+            chunk_size (int): 워커 작업 하나가 담당하는 추첨 횟수
+                (기본값: 프로세스당 CHUNKS_PER_WORKER개 작업이 되도록 나누되 MAX_CHUNK_SIZE 이하)
+            batch_size (int): 워커가 한 번에 메모리에 올리는 추첨 횟수
+            seed (int): 전체 시드 (작업별 스트림은 SeedSequence로 분기)
+            on_progress (callable): 작업이 끝날 때마다 (완료된_추첨수, 전체_추첨수)로 호출
+
+        Returns:
+            np.ndarray: item_ids 순서의 추첨 횟수
+        """
+        workers = workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = min(MAX_CHUNK_SIZE, max(1, math.ceil(rolls / (workers * CHUNKS_PER_WORKER))))
+        chunks = [chunk_size] * (rolls // chunk_size)
+        if rolls % chunk_size:
+            chunks.append(rolls % chunk_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+        counts = np.zeros(len(self.sampler.item_ids), dtype=np.int64)
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.sampler,)) as executor:
+            futures = [
+                executor.submit(_simulate_chunk, seed_sequence, chunk, batch_size)
+                for seed_sequence, chunk in zip(seeds, chunks)
+            ]
+            for future in as_completed(futures):
+                chunk_rolls, chunk_counts = future.result()
+                counts += chunk_counts
+                done += chunk_rolls
+                if on_progress:
+                    on_progress(done, rolls)
+        return counts
+
+    def report(self, counts, confidence=0.999):
+        """
+        추첨 결과를 계산된 확률과 비교
+
+        Args:
+            counts (np.ndarray): simulate()가 반환한 아이템별 추첨 횟수
+            confidence (float): 신뢰구간 및 아이템별 이상 판정에 사용할 신뢰수준
+
+        Returns:
+            dict: rolls, chi_square, dof, p_value, items(아이템별 비교 결과 목록)
+        """
+        rolls = int(counts.sum())
+        z_critical = NormalDist().inv_cdf(0.5 + confidence / 2)
+        chi_square = 0.0
+        dof = -1
+        items = []
+
+        for index, item_id in enumerate(self.sampler.item_ids):
+            expected_rate = self.sampler.weights[index] / self.sampler.total_parts
+            observed = int(counts[index])
+            observed_rate = observed / rolls if rolls else 0.0
+            ci_low, ci_high = self._wilson_interval(observed, rolls, z_critical)
+
+            expected_count = expected_rate * rolls
+            if expected_count > 0:
+                chi_square += (observed - expected_count) ** 2 / expected_count
+                dof += 1
+                z = (observed - expected_count) / math.sqrt(expected_count * (1 - expected_rate) or 1)
+            else:
+                z = math.inf if observed else 0.0
+
+            items.append({
+                "item_id": item_id,
+                "expected_percentage": expected_rate * 100,
+                "observed_count": observed,
+                "observed_percentage": observed_rate * 100,
+                "ci_low_percentage": ci_low * 100,
+                "ci_high_percentage": ci_high * 100,
+                "z": z,
+                "flagged": abs(z) > z_critical,
+            })
+
+        return {
+            "rolls": rolls,
+            "chi_square": chi_square,
+            "dof": max(dof, 0),
+            "p_value": self._chi_square_p_value(chi_square, dof),
+            "items": items,
+        }
+
+    @staticmethod
+    def _wilson_interval(successes, trials, z):
+        """이항 비율의 Wilson 신뢰구간 (희귀 아이템에서도 0 미만으로 내려가지 않음)"""
+        if trials == 0:
+            return 0.0, 1.0
+        rate = successes / trials
+        denominator = 1 + z * z / trials
+        center = (rate + z * z / (2 * trials)) / denominator
+        margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+        return max(0.0, center - margin), min(1.0, center + margin)
+
+    @staticmethod
+    def _chi_square_p_value(chi_square, dof):
+        """카이제곱 상위 확률 (Wilson-Hilferty 정규 근사, scipy 없이 계산)"""
+        if dof <= 0:
+            return 1.0
+        k = 2 / (9 * dof)
+        z = ((chi_square / dof) ** (1 / 3) - (1 - k)) / math.sqrt(k)
+        return 1 - NormalDist().cdf(z)
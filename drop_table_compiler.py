@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import heapq
+from decimal import Decimal
+
+
+class DropTableCompiler:
+    """
+    중첩된 드랍 테이블(그룹 안의 그룹)을 리프 아이템 확률로 평탄화
+
+    모든 계산은 정수 고정소수점으로 수행하며, 각 단계에서 최대 잉여(largest remainder)
+    방식으로 배분하므로 자식들의 합이 항상 부모 확률과 정확히 일치합니다.
+
+    트리 형식:
+        {
+            "골드": 70,                                   # 아이템: 그룹 내 확률(백분율)
+            "무기": {"percentage": 30, "items": {         # 하위 그룹
+                "검": 50,
+                "활": 50,
+            }},
+        }
+    """
+
+    def __init__(self, max_probability=1000000000):
+        self.MAX_PROBABILITY = max_probability
+        # 백분율 1%를 나타내는 정수 단위 (십억분율에서는 1e-7%까지 표현)
+        self.weight_scale = max_probability // 100
+
+    def to_fixed(self, percentage):
+        """백분율을 정수 가중치로 변환 (float 표현 오차 없이 10진수 기준으로 반올림)"""
+        if isinstance(percentage, int):
+            return percentage * self.weight_scale
+        return int((Decimal(str(percentage)) * self.weight_scale).to_integral_value())
+
+    @staticmethod
+    def apportion(total_parts, weights):
+        """
+        total_parts를 정수 가중치 비율대로 나누되, 합이 정확히 total_parts가 되도록 배분
+
+        Args:
+            total_parts (int): 나눌 전체 확률 (설정된 스케일)
+            weights (list): 정수 가중치 목록
+
+        Returns:
+            list: 가중치 순서대로 배분된 정수 확률
+        """
+        weight_sum = sum(weights)
+        if weight_sum <= 0:
+            raise ValueError("가중치의 합은 0보다 커야 합니다.")
+
+        quotas = []
+        remainders = []
+        for weight in weights:
+            quota, remainder = divmod(total_parts * weight, weight_sum)
+            quotas.append(quota)
+            remainders.append(remainder)
+
+        # 절사로 남은 몫을 나머지가 큰 순서대로 1씩 배분 (동률이면 먼저 나온 항목 우선)
+        leftover = total_parts - sum(quotas)
+        for index in heapq.nlargest(leftover, range(len(weights)), key=remainders.__getitem__):
+            quotas[index] += 1
+        return quotas
+
+    def calculate_multiple_items(self, group_total_probability, items):
+        """
+        ProbabilityConverter.calculate_multiple_items의 정확한 정수 버전
+
+        Args:
+            group_total_probability (int): 그룹의 전체 확률 (설정된 스케일)
+            items (dict): {아이템_id: 그룹내_확률(백분율)} 형태
+
+        Returns:
+            dict: {아이템_id: 전체_확률(설정된 스케일)} 형태, 합계는 group_total_probability와 일치
+        """
+        return self.compile(items, group_total_probability)
+
+    def compile(self, tree, total_parts=None):
+        """
+        드랍 테이블 트리를 리프 아이템 확률로 평탄화
+
+        같은 아이템 ID가 여러 그룹에 있으면 확률을 합산합니다.
+
+        Args:
+            tree (dict): 최상위 그룹의 items 딕셔너리
+            total_parts (int): 최상위 그룹의 전체 확률 (기본값: MAX_PROBABILITY)
+
+        Returns:
+            dict: {아이템_id: 전체_확률(설정된 스케일)} 형태
+        """
+        if total_parts is None:
+            total_parts = self.MAX_PROBABILITY
+
+        results = {}
+        # 재귀 대신 스택을 사용해 깊은 계층에서도 재귀 한도에 걸리지 않도록 함
+        stack = [(total_parts, tree)]
+        while stack:
+            parts, items = stack.pop()
+            if not items:
+                raise ValueError("빈 그룹은 확률을 배분할 수 없습니다.")
+
+            names = list(items)
+            nodes = [items[name] for name in names]
+            weights = [
+                self.to_fixed(node["percentage"] if isinstance(node, dict) else node)
+                for node in nodes
+            ]
+            for name, node, share in zip(names, nodes, self.apportion(parts, weights)):
+                if isinstance(node, dict):
+                    stack.append((share, node["items"]))
+                else:
+                    results[name] = results.get(name, 0) + share
+
+        return results
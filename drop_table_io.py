@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import time
+
+import pandas as pd
+
+COLUMNS = ["group", "item_id", "percentage"]
+
+
+def detect_format(source, file_format=None):
+    """파일 경로(또는 name 속성이 있는 파일 객체)의 확장자로 csv / parquet 형식을 판별"""
+    if file_format:
+        return file_format
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    extension = os.path.splitext(str(name))[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {name}")
+
+
+def _import_pyarrow_parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 파일을 사용하려면 pyarrow를 설치하세요: pip install pyarrow") from e
+    return pa, pq
+
+
+class DropTableImporter:
+    """
+    CSV / Parquet 드랍 테이블(group, item_id, percentage)을 청크 단위로 스트리밍 임포트
+
+    파일 전체를 메모리에 올리지 않고 청크가 도착하는 대로 검증하고 전체 확률로 변환하며,
+    그룹별 확률 합계는 한 번의 순회로 누적해 validate_percentages와 같은 기준으로 검증합니다.
+    """
+
+    def __init__(self, converter, group_total, group_totals=None, chunk_size=50000):
+        """
+        Args:
+            converter (ProbabilityConverter): 확률 변환기
+            group_total (int): 그룹 전체 확률 기본값 (설정된 스케일)
+            group_totals (dict): {그룹: 그룹_전체_확률} 형태로 그룹별 값을 지정
+            chunk_size (int): 한 번에 읽는 행 수
+        """
+        self.converter = converter
+        self.group_total = group_total
+        self.group_totals = group_totals or {}
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.invalid_rows = 0
+        self.elapsed = 0.0
+        self.group_sums = {}
+        self._seen = set()
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def _read_chunks(self, source, file_format):
+        if file_format == "csv":
+            yield from pd.read_csv(source, chunksize=self.chunk_size,
+                                   dtype={"group": str, "item_id": str})
+        else:
+            _, pq = _import_pyarrow_parquet()
+            parquet_file = pq.ParquetFile(source)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=COLUMNS):
+                yield batch.to_pandas()
+
+    def iter_chunks(self, source, file_format=None, group=None):
+        """
+        파일을 청크 단위로 읽어 검증/변환된 DataFrame을 순서대로 반환
+
+        Args:
+            source (str | file): 파일 경로 또는 파일 객체
+            file_format (str): "csv" 또는 "parquet" (생략하면 확장자로 판별)
+            group (str): 지정하면 해당 그룹의 행만 반환
+
+        Yields:
+            pd.DataFrame: group, item_id, percentage, item_probability 컬럼
+        """
+        file_format = detect_format(source, file_format)
+        # CSV 파싱/Parquet 디코딩도 포함하도록 청크를 읽는 시간부터 측정 (호출한 쪽이 청크를 처리하는 시간은 제외)
+        start = time.perf_counter()
+        for chunk in self._read_chunks(source, file_format):
+            missing = [column for column in COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"필요한 컬럼이 없습니다: {missing}")
+
+            chunk = chunk[COLUMNS].copy()
+            chunk["group"] = chunk["group"].fillna("").astype(str)
+            chunk["item_id"] = chunk["item_id"].astype("string").str.strip()
+            chunk["percentage"] = pd.to_numeric(chunk["percentage"], errors="coerce")
+            if group is not None:
+                chunk = chunk[chunk["group"] == group]
+
+            # 잘못된 행(빈 ID, 숫자가 아니거나 0~100% 범위를 벗어난 확률, 그룹 내 중복 ID)은 제외
+            valid = (
+                chunk["item_id"].notna()
+                & (chunk["item_id"] != "")
+                & chunk["percentage"].between(0.0, 100.0)
+            ).to_numpy()
+            keys = list(zip(chunk["group"].tolist(), chunk["item_id"].fillna("").tolist()))
+            for index, key in enumerate(keys):
+                if valid[index]:
+                    if key in self._seen:
+                        valid[index] = False
+                    else:
+                        self._seen.add(key)
+
+            self.rows += len(chunk)
+            self.invalid_rows += int((~valid).sum())
+            chunk = chunk[valid]
+            chunk["item_id"] = chunk["item_id"].astype(str)
+
+            for group_name, total in chunk.groupby("group", sort=False)["percentage"].sum().items():
+                self.group_sums[group_name] = self.group_sums.get(group_name, 0.0) + total
+
+            group_totals = chunk["group"].map(self.group_totals).fillna(self.group_total)
+            chunk["item_probability"] = self.converter.calculate_batch(
+                group_totals.to_numpy(), chunk["percentage"].to_numpy()
+            )
+            self.elapsed += time.perf_counter() - start
+            yield chunk
+            start = time.perf_counter()
+        self.elapsed += time.perf_counter() - start
+
+    def validation(self):
+        """그룹별 (합계가 100%인지, 합계) 결과를 반환"""
+        return {
+            group: self.converter.validate_percentages({group: total})
+            for group, total in self.group_sums.items()
+        }
+
+
+def export_chunks(chunks, destination, file_format=None):
+    """
+    계산 결과 청크를 순서대로 CSV / Parquet으로 스트리밍 저장
+
+    Args:
+        chunks (iterable): pd.DataFrame 청크
+        destination (str | file): 파일 경로 또는 쓰기 가능한 바이너리 파일 객체
+        file_format (str): "csv" 또는 "parquet" (생략하면 확장자로 판별)
+
+    Returns:
+        int: 저장한 행 수
+    """
+    file_format = detect_format(destination, file_format)
+    rows = 0
+    if file_format == "csv":
+        header = True
+        for chunk in chunks:
+            if isinstance(destination, (str, os.PathLike)):
+                chunk.to_csv(destination, mode="w" if header else "a", header=header, index=False)
+            else:
+                destination.write(chunk.to_csv(header=header, index=False).encode("utf-8"))
+            header = False
+            rows += len(chunk)
+        return rows
+
+    pa, pq = _import_pyarrow_parquet()
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(destination, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
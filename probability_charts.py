@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대량 아이템용 시각화 데이터 사전 집계
+
+아이템 수와 무관하게 브라우저로 보내는 데이터 크기가 일정하도록,
+차트와 테이블에 필요한 만큼만 서버에서 미리 집계합니다.
+"""
+import numpy as np
+
+OTHERS_LABEL = "기타"
+
+
+def top_n_with_others(item_ids, parts, n):
+    """
+    확률이 높은 상위 n개 아이템과 나머지를 합친 "기타" 항목을 반환
+
+    Args:
+        item_ids (list): 아이템 ID 목록
+        parts (np.ndarray): 아이템별 전체 확률 (설정된 스케일)
+        n (int): 개별로 표시할 아이템 수
+
+    Returns:
+        tuple: (라벨 목록, 확률 배열) - 확률이 높은 순서, 나머지가 있으면 마지막이 "기타"
+    """
+    parts = np.asarray(parts, dtype=np.int64)
+    if len(parts) <= n:
+        order = np.argsort(-parts, kind="stable")
+        return [item_ids[i] for i in order], parts[order]
+
+    # 전체 정렬 없이 상위 n개만 선택한 뒤 그 안에서만 정렬
+    top = np.argpartition(-parts, n - 1)[:n]
+    top = top[np.argsort(-parts[top], kind="stable")]
+    labels = [item_ids[i] for i in top] + [f"{OTHERS_LABEL} ({len(parts) - n:,}개)"]
+    values = np.append(parts[top], parts.sum() - parts[top].sum())
+    return labels, values
+
+
+def rarity_histogram(parts, max_probability, bins_per_decade=4):
+    """
+    아이템 희귀도 분포를 로그 스케일 구간으로 집계
+
+    Args:
+        parts (np.ndarray): 아이템별 전체 확률 (설정된 스케일)
+        max_probability (int): 100%에 해당하는 값 (MAX_PROBABILITY)
+        bins_per_decade (int): 10배 구간마다 나눌 구간 수
+
+    Returns:
+        tuple: (구간 하한 백분율 배열, 구간 상한 백분율 배열, 구간별 아이템 수 배열, 확률 0인 아이템 수)
+    """
+    parts = np.asarray(parts, dtype=np.int64)
+    positive = parts[parts > 0]
+    zero_count = len(parts) - len(positive)
+    if len(positive) == 0:
+        empty = np.array([], dtype=np.float64)
+        return empty, empty, np.array([], dtype=np.int64), zero_count
+
+    percentages = positive / (max_probability / 100)
+    low = np.floor(np.log10(percentages.min()) * bins_per_decade) / bins_per_decade
+    high = np.ceil(np.log10(percentages.max()) * bins_per_decade) / bins_per_decade
+    if high <= low:
+        high = low + 1 / bins_per_decade
+    edges = 10 ** np.linspace(low, high, int(round((high - low) * bins_per_decade)) + 1)
+    counts, edges = np.histogram(percentages, bins=edges)
+    return edges[:-1], edges[1:], counts, zero_count
+
+
+def sorted_page(values, descending, page, page_size, order=None):
+    """
+    정렬 기준 값으로 정렬했을 때 page번째(0부터) 페이지에 해당하는 인덱스를 반환
+
+    Args:
+        values (np.ndarray): 정렬 기준 값
+        descending (bool): 내림차순 여부
+        page (int): 페이지 번호 (0부터)
+        page_size (int): 페이지당 행 수
+        order (np.ndarray): 미리 계산한 정렬 순서 (있으면 재사용)
+
+    Returns:
+        tuple: (페이지 인덱스 배열, 전체 정렬 순서)
+    """
+    if order is None:
+        order = np.argsort(values, kind="stable")
+        if descending:
+            order = order[::-1]
+    start = page * page_size
+    return order[start:start + page_size], order
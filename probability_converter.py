@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# NumPy / pandas는 배치 계산에서만 필요하므로 해당 메서드 안에서 불러옵니다.
+# (스칼라 계산만 쓰는 워커 프로세스와 CLI의 시작 시간을 줄이기 위함)
+
+
+class ProbabilityConverter:
+    def __init__(self):
+        self.MAX_PROBABILITY = 1000000000  # 십억분율 (1,000,000,000 = 100%)
+        self.scale_name = "십억분율"
+    
+    def percentage_to_parts(self, percentage):
+        """백분율을 설정된 스케일로 변환"""
+        return int(percentage * (self.MAX_PROBABILITY / 100))
+    
+    def parts_to_percentage(self, parts):
+        """설정된 스케일을 백분율로 변환"""
+        return parts / (self.MAX_PROBABILITY / 100)
+    
+    def calculate_item_probability(self, group_total_probability, item_percentage):
+        """
+        그룹 내 아이템의 개별 확률을 전체 확률 기준으로 계산
+        
+        Args:
+            group_total_probability (int): 그룹의 전체 확률 (설정된 스케일)
+            item_percentage (float): 그룹 내 아이템의 확률 (백분율)
+        
+        Returns:
+            int: 전체 확률 기준 아이템 확률 (설정된 스케일)
+        """
+        # 그룹 확률의 백분율 계산
+        group_percentage = self.parts_to_percentage(group_total_probability)
+        
+        # 전체 기준 아이템 확률 계산
+        total_item_percentage = (group_percentage * item_percentage) / 100
+        
+        # 설정된 스케일로 변환
+        total_item_probability = self.percentage_to_parts(total_item_percentage)
+        
+        return total_item_probability
+    
+    def calculate_multiple_items(self, group_total_probability, items):
+        """
+        여러 아이템의 확률을 한번에 계산
+        
+        Args:
+            group_total_probability (int): 그룹의 전체 확률 (설정된 스케일)
+            items (dict): {아이템_id: 그룹내_확률(백분율)} 형태
+        
+        Returns:
+            dict: {아이템_id: 전체_확률(설정된 스케일)} 형태
+        """
+        results = {}
+        
+        for item_id, item_percentage in items.items():
+            item_probability = self.calculate_item_probability(group_total_probability, item_percentage)
+            results[item_id] = item_probability
+        
+        return results
+    
+    def calculate_batch(self, group_total_probabilities, item_percentages):
+        """
+        calculate_item_probability의 벡터화 버전 (NumPy 한 번의 연산으로 계산)
+
+        스칼라 경로와 같은 순서로 float64 연산을 수행한 뒤 0 방향으로 절사하므로
+        calculate_item_probability와 결과가 정확히 일치합니다.
+
+        Args:
+            group_total_probabilities (array-like | int): 그룹 전체 확률 (설정된 스케일)
+            item_percentages (array-like): 그룹 내 아이템 확률 (백분율)
+
+        Returns:
+            np.ndarray: 전체 확률 기준 아이템 확률 (int64, 설정된 스케일)
+        """
+        import numpy as np
+
+        scale = self.MAX_PROBABILITY / 100
+        group_totals = np.asarray(group_total_probabilities, dtype=np.float64)
+        percentages = np.asarray(item_percentages, dtype=np.float64)
+
+        group_percentage = group_totals / scale
+        total_item_percentage = (group_percentage * percentages) / 100
+        return (total_item_percentage * scale).astype(np.int64)
+
+    def calculate_catalog(self, catalog):
+        """
+        드랍 테이블 전체(여러 그룹)를 한 번에 계산
+
+        Args:
+            catalog (pd.DataFrame | dict): group_id, group_total, item_id,
+                item_percentage 컬럼(또는 같은 이름의 배열)을 가진 카탈로그
+
+        Returns:
+            pd.DataFrame: 입력 컬럼에 item_probability(설정된 스케일) 컬럼을 추가한 결과
+        """
+        import pandas as pd
+
+        columns = ["group_id", "group_total", "item_id", "item_percentage"]
+        df = catalog if isinstance(catalog, pd.DataFrame) else pd.DataFrame(catalog)
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"카탈로그에 필요한 컬럼이 없습니다: {missing}")
+
+        result = df[columns].copy()
+        result["item_probability"] = self.calculate_batch(
+            result["group_total"].to_numpy(), result["item_percentage"].to_numpy()
+        )
+        return result
+
+    def validate_percentages(self, percentages):
+        """그룹 내 확률의 합이 100%인지 검증"""
+        total = sum(percentages.values())
+        return abs(total - 100.0) < 0.01, total  # 소수점 오차 고려
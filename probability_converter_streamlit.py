@@ -1,68 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import io
+import os
+from itertools import islice
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-
-class ProbabilityConverter:
-    def __init__(self):
-        self.MAX_PROBABILITY = 1000000000  # 십억분율 (1,000,000,000 = 100%)
-        self.scale_name = "십억분율"
-    
-    def percentage_to_parts(self, percentage):
-        """백분율을 설정된 스케일로 변환"""
-        return int(percentage * (self.MAX_PROBABILITY / 100))
-    
-    def parts_to_percentage(self, parts):
-        """설정된 스케일을 백분율로 변환"""
-        return parts / (self.MAX_PROBABILITY / 100)
-    
-    def calculate_item_probability(self, group_total_probability, item_percentage):
-        """
-        그룹 내 아이템의 개별 확률을 전체 확률 기준으로 계산
-        
-        Args:
-            group_total_probability (int): 그룹의 전체 확률 (설정된 스케일)
-            item_percentage (float): 그룹 내 아이템의 확률 (백분율)
-        
-        Returns:
-            int: 전체 확률 기준 아이템 확률 (설정된 스케일)
-        """
-        # 그룹 확률의 백분율 계산
-        group_percentage = self.parts_to_percentage(group_total_probability)
-        
-        # 전체 기준 아이템 확률 계산
-        total_item_percentage = (group_percentage * item_percentage) / 100
-        
-        # 설정된 스케일로 변환
-        total_item_probability = self.percentage_to_parts(total_item_percentage)
-        
-        return total_item_probability
-    
-    def calculate_multiple_items(self, group_total_probability, items):
-        """
-        여러 아이템의 확률을 한번에 계산
-        
-        Args:
-            group_total_probability (int): 그룹의 전체 확률 (설정된 스케일)
-            items (dict): {아이템_id: 그룹내_확률(백분율)} 형태
-        
-        Returns:
-            dict: {아이템_id: 전체_확률(설정된 스케일)} 형태
-        """
-        results = {}
-        
-        for item_id, item_percentage in items.items():
-            item_probability = self.calculate_item_probability(group_total_probability, item_percentage)
-            results[item_id] = item_probability
-        
-        return results
-    
-    def validate_percentages(self, percentages):
-        """그룹 내 확률의 합이 100%인지 검증"""
-        total = sum(percentages.values())
-        return abs(total - 100.0) < 0.01, total  # 소수점 오차 고려
+
+from probability_converter import ProbabilityConverter
+from probability_result_model import ProbabilityResultModel
+from rerun_profiler import profiler, show_debug_panel
+
+# pandas / NumPy / Plotly와 이를 사용하는 모듈은 실제로 테이블이나 차트를 그릴 때만 불러옵니다.
 
 
 def main():
@@ -74,6 +22,7 @@ def main():
     
     st.title("🎲 드랍률 계산기")
     st.markdown("---")
+    show_debug_panel("probability")
     
     converter = ProbabilityConverter()
     
@@ -97,9 +46,13 @@ def main():
         
         st.subheader("🎯 아이템 정보")
         
-        # 세션 상태 초기화
-        if 'items' not in st.session_state:
-            st.session_state['items'] = {}
+        # 세션 상태 초기화 (계산 결과 모델은 재실행 사이에 유지되며 변경된 아이템만 다시 계산)
+        if 'result_model' not in st.session_state:
+            st.session_state['result_model'] = ProbabilityResultModel(converter, group_total)
+            st.session_state['result_model'].replace_items(st.session_state.get('items', {}))
+        model = st.session_state['result_model']
+        model.set_group_total(group_total)
+        st.session_state['items'] = model.items
         
         # 아이템 추가 폼
         with st.form("add_item_form"):
@@ -121,109 +74,367 @@ def main():
             submit_button = st.form_submit_button("아이템 추가")
             
             if submit_button and item_id:
-                if item_id in st.session_state['items']:
+                if item_id in model.items:
                     st.error(f"'{item_id}'는 이미 존재하는 아이템 ID입니다.")
                 else:
-                    st.session_state['items'][item_id] = item_prob
+                    model.add_item(item_id, item_prob)
                     st.success(f"'{item_id}' 아이템이 추가되었습니다.")
                     st.rerun()
         
+        # 파일에서 아이템 일괄 가져오기
+        with st.expander("📂 파일에서 가져오기 (CSV / Parquet)"):
+            uploaded_file = st.file_uploader("group, item_id, percentage 컬럼을 가진 파일", type=["csv", "parquet"])
+            import_group = st.text_input("가져올 그룹 (비워두면 전체)")
+
+            if st.button("가져오기") and uploaded_file is not None:
+                from drop_table_io import DropTableImporter
+
+                importer = DropTableImporter(converter, group_total)
+                imported_items = {}
+                with profiler.span("import"):
+                    for chunk in importer.iter_chunks(uploaded_file, group=import_group or None):
+                        imported_items.update(zip(chunk["item_id"], chunk["percentage"]))
+
+                # 그룹별 합계 검증 (validate_percentages 기준)
+                validation = importer.validation()
+                failed_groups = [
+                    f"{group or '(그룹 없음)'} {total:.2f}%"
+                    for group, (is_valid, total) in validation.items() if not is_valid
+                ]
+                if len(validation) > 1:
+                    message = f"파일에 {len(validation)}개 그룹이 있습니다. 가져올 그룹을 지정하세요."
+                    if failed_groups:
+                        message += f" (합계가 100%가 아닌 그룹: {', '.join(failed_groups)})"
+                    st.error(message)
+                else:
+                    model.replace_items(imported_items)
+                    st.session_state['import_message'] = (
+                        f"{len(imported_items):,}개 아이템을 가져왔습니다. "
+                        f"(전체 {importer.rows:,}행, 제외 {importer.invalid_rows:,}행, "
+                        f"{importer.rows_per_sec:,.0f} rows/sec)"
+                    )
+                    if failed_groups:
+                        st.session_state['import_warning'] = (
+                            f"⚠️ 가져온 그룹의 확률 합계가 100%가 아닙니다: {failed_groups[0]}"
+                        )
+                    st.rerun()
+
+            if 'import_message' in st.session_state:
+                st.info(st.session_state.pop('import_message'))
+            if 'import_warning' in st.session_state:
+                st.warning(st.session_state.pop('import_warning'))
+
         # 현재 아이템 목록
-        if st.session_state['items']:
+        if model.items:
+            import pandas as pd
+
             st.subheader("📝 현재 아이템 목록")
             
-            items_data = []
-            for item_id, prob in st.session_state['items'].items():
-                items_data.append({"아이템 ID": item_id, "그룹 내 확률 (%)": prob})
-            
-            df_items = pd.DataFrame(items_data)
+            with profiler.span("dataframe"):
+                df_items = model.memoize("items_frame", lambda: pd.DataFrame({
+                    "아이템 ID": list(model.items.keys()),
+                    "그룹 내 확률 (%)": list(model.items.values())
+                }))
             st.dataframe(df_items, use_container_width=True)
             
             # 아이템 삭제
-            item_to_remove = st.selectbox("삭제할 아이템 선택", ["선택하세요"] + list(st.session_state['items'].keys()))
+            item_to_remove = st.selectbox("삭제할 아이템 선택", ["선택하세요"] + list(model.items.keys()))
             
             if st.button("선택한 아이템 삭제") and item_to_remove != "선택하세요":
-                del st.session_state['items'][item_to_remove]
+                model.remove_item(item_to_remove)
                 st.success(f"'{item_to_remove}' 아이템이 삭제되었습니다.")
                 st.rerun()
             
             # 모든 아이템 삭제
             if st.button("모든 아이템 삭제", type="secondary"):
-                st.session_state['items'] = {}
+                model.clear()
                 st.success("모든 아이템이 삭제되었습니다.")
                 st.rerun()
     
     with col2:
         st.header("📊 계산 결과")
         
-        if st.session_state['items']:
+        if model.items:
+            import numpy as np
+            import pandas as pd
+
+            from probability_charts import rarity_histogram, sorted_page, top_n_with_others
+
             # 확률 검증
-            is_valid, total_percentage = converter.validate_percentages(st.session_state['items'])
+            is_valid, total_percentage = model.validate()
             
             if not is_valid:
                 st.warning(f"⚠️ 그룹 내 확률의 합이 100%가 아닙니다. (현재: {total_percentage:.2f}%)")
             else:
                 st.success("✅ 그룹 내 확률의 합이 100%입니다.")
             
-            # 계산 수행
-            results = converter.calculate_multiple_items(group_total, st.session_state['items'])
-            
-            # 결과 테이블 생성
-            result_data = []
-            total_calculated = 0
+            # 계산 결과 (합이 100%이면 정수 배분으로 합계가 그룹 확률과 정확히 일치하도록 계산)
+            with profiler.span("calculate"):
+                results = model.results()
+                total_calculated = model.results_total()
             
-            for item_id, group_prob in st.session_state['items'].items():
-                total_prob = results[item_id]
-                total_percentage_calc = converter.parts_to_percentage(total_prob)
-                total_calculated += total_prob
-                
-                result_data.append({
-                    "아이템 ID": item_id,
-                    "그룹 내 확률 (%)": f"{group_prob:.2f}%",
-                    f"전체 확률 ({converter.scale_name})": f"{total_prob:,}",
-                    "전체 확률 (%)": f"{total_percentage_calc:.4f}%"
+            # 아이템 수와 무관하게 한 페이지만 화면으로 보내도록 숫자 배열을 유지 (아이템 집합이 바뀔 때만 다시 생성)
+            def build_result_arrays():
+                item_ids = list(model.items.keys())
+                percentages = np.fromiter(model.items.values(), dtype=np.float64, count=len(item_ids))
+                parts = np.fromiter((results[item_id] for item_id in item_ids), dtype=np.int64, count=len(item_ids))
+                return item_ids, percentages, parts
+
+            with profiler.span("calculate"):
+                item_ids, percentages, parts = model.memoize("result_arrays", build_result_arrays)
+
+            col_sort, col_order, col_size = st.columns([2, 1, 1])
+            with col_sort:
+                sort_by = st.selectbox("정렬 기준", ["입력 순서", "아이템 ID", "전체 확률"])
+            with col_order:
+                descending = st.selectbox("정렬 방향", ["오름차순", "내림차순"]) == "내림차순"
+            with col_size:
+                page_size = st.selectbox("페이지당 행 수", [20, 50, 100, 500], index=1)
+
+            page_count = max(1, -(-len(item_ids) // page_size))
+            page = st.number_input(f"페이지 (전체 {page_count:,})", min_value=1, max_value=page_count, value=1) - 1
+
+            sort_values = {
+                "입력 순서": lambda: np.arange(len(item_ids)),
+                "아이템 ID": lambda: np.array(item_ids, dtype=str),
+                "전체 확률": lambda: parts,
+            }[sort_by]
+            with profiler.span("dataframe"):
+                order = model.memoize(f"order_{sort_by}_{descending}",
+                                      lambda: sorted_page(sort_values(), descending, 0, 0)[1])
+                page_index, _ = sorted_page(None, descending, page, page_size, order)
+
+                page_parts = parts[page_index]
+                df_results = pd.DataFrame({
+                    "아이템 ID": [item_ids[i] for i in page_index],
+                    "그룹 내 확률 (%)": [f"{prob:.2f}%" for prob in percentages[page_index]],
+                    f"전체 확률 ({converter.scale_name})": [f"{part:,}" for part in page_parts.tolist()],
+                    "전체 확률 (%)": [f"{converter.parts_to_percentage(part):.4f}%" for part in page_parts.tolist()]
                 })
-            
-            # 합계 행 추가
-            result_data.append({
-                "아이템 ID": "합계",
-                "그룹 내 확률 (%)": "100.00%",
-                f"전체 확률 ({converter.scale_name})": f"{total_calculated:,}",
-                "전체 확률 (%)": f"{converter.parts_to_percentage(total_calculated):.4f}%"
-            })
-            
-            df_results = pd.DataFrame(result_data)
-            st.dataframe(df_results, use_container_width=True)
+            st.dataframe(df_results, use_container_width=True, hide_index=True)
+
+            # 합계
+            st.markdown(
+                f"**합계** ({len(item_ids):,}개): {total_calculated:,} {converter.scale_name} "
+                f"({converter.parts_to_percentage(total_calculated):.4f}%)"
+            )
+
+            # 계산 결과 내보내기
+            def iter_result_chunks(chunk_size=50000):
+                item_iter = iter(model.items.items())
+                while True:
+                    rows = list(islice(item_iter, chunk_size))
+                    if not rows:
+                        return
+                    yield pd.DataFrame({
+                        "group": "",
+                        "item_id": [item_id for item_id, _ in rows],
+                        "percentage": [prob for _, prob in rows],
+                        "item_probability": [results[item_id] for item_id, _ in rows],
+                    })
+
+            def build_export(file_format):
+                from drop_table_io import export_chunks
+
+                buffer = io.BytesIO()
+                export_chunks(iter_result_chunks(), buffer, file_format)
+                return buffer.getvalue()
+
+            col_csv, col_parquet = st.columns([1, 1])
+            for column, file_format in ((col_csv, "csv"), (col_parquet, "parquet")):
+                with column:
+                    with profiler.span("export"):
+                        export_data = model.memoize(f"export_{file_format}", lambda: build_export(file_format))
+                    st.download_button(
+                        f"{file_format.upper()}로 내보내기",
+                        data=export_data,
+                        file_name=f"drop_table.{file_format}",
+                        use_container_width=True
+                    )
             
             # 시각화
             st.subheader("📈 시각화")
             
-            # 파이 차트용 데이터 준비
-            chart_data = []
-            for item_id, group_prob in st.session_state['items'].items():
-                total_prob = results[item_id]
-                total_percentage_calc = converter.parts_to_percentage(total_prob)
-                chart_data.append({
-                    "아이템": item_id,
-                    "전체 확률 (%)": total_percentage_calc,
-                    converter.scale_name: total_prob
+            top_n = st.slider("개별 표시할 상위 아이템 수", min_value=5, max_value=50, value=20)
+
+            # 상위 N개 + 기타로 서버에서 미리 집계해 슬라이스 수를 일정하게 유지
+            def build_pie_chart():
+                import plotly.express as px
+
+                labels, values = top_n_with_others(item_ids, parts, top_n)
+                df_chart = pd.DataFrame({
+                    "아이템": labels,
+                    "전체 확률 (%)": values / (converter.MAX_PROBABILITY / 100),
+                    converter.scale_name: values
                 })
-            
-            df_chart = pd.DataFrame(chart_data)
-            
-            # 파이 차트
-            fig_pie = px.pie(
-                df_chart, 
-                values="전체 확률 (%)", 
-                names="아이템",
-                title="아이템별 전체 확률 분포",
-                hover_data=[converter.scale_name]
-            )
-            fig_pie.update_traces(textinfo='label+percent')
+                fig_pie = px.pie(
+                    df_chart, 
+                    values="전체 확률 (%)", 
+                    names="아이템",
+                    title="아이템별 전체 확률 분포",
+                    hover_data=[converter.scale_name]
+                )
+                fig_pie.update_traces(textinfo='label+percent')
+                return fig_pie
+
+            with profiler.span("figure"):
+                fig_pie = model.memoize(f"pie_chart_{top_n}", build_pie_chart)
             st.plotly_chart(fig_pie, use_container_width=True)
+
+            # 희귀도 분포 (로그 스케일 구간별 아이템 수)
+            def build_rarity_chart():
+                import plotly.graph_objects as go
+
+                lower, upper, counts, zero_count = rarity_histogram(parts, converter.MAX_PROBABILITY)
+                fig_rarity = go.Figure(go.Bar(
+                    x=[f"{low:.3g}~{high:.3g}%" for low, high in zip(lower, upper)],
+                    y=counts,
+                    hovertemplate="%{x}<br>%{y:,}개<extra></extra>"
+                ))
+                fig_rarity.update_layout(
+                    title=f"아이템 희귀도 분포 (로그 구간, 확률 0인 아이템 {zero_count:,}개 제외)",
+                    xaxis_title="전체 확률 (%)",
+                    yaxis_title="아이템 수",
+                    bargap=0.05
+                )
+                return fig_rarity
+
+            with profiler.span("figure"):
+                fig_rarity = model.memoize("rarity_chart", build_rarity_chart)
+            st.plotly_chart(fig_rarity, use_container_width=True)
+
+            # 몬테카를로 검증
+            st.subheader("🧪 시뮬레이션")
+            col_rolls, col_workers = st.columns([1, 1])
+            with col_rolls:
+                rolls_millions = st.number_input("추첨 횟수 (백만 회)", min_value=1, value=100, step=100)
+            with col_workers:
+                workers = st.number_input("프로세스 수", min_value=1, value=os.cpu_count() or 1, step=1)
+
+            if st.button("시뮬레이션 실행"):
+                from drop_simulation import DropSimulator
+
+                simulator = DropSimulator(results, max(converter.MAX_PROBABILITY, sum(results.values())))
+                rolls = int(rolls_millions) * 1000000
+                progress = st.progress(0.0, text="시뮬레이션 준비 중...")
+
+                def on_progress(done, total):
+                    progress.progress(done / total, text=f"{done:,} / {total:,}회 완료")
+
+                with profiler.span("simulate"):
+                    counts = simulator.simulate(rolls, workers=int(workers), on_progress=on_progress)
+                report = simulator.report(counts)
+
+                sim_data = []
+                for row in report["items"]:
+                    sim_data.append({
+                        "아이템 ID": "드랍 없음" if row["item_id"] is None else row["item_id"],
+                        "계산 확률 (%)": f"{row['expected_percentage']:.6f}%",
+                        "관측 횟수": f"{row['observed_count']:,}",
+                        "관측 확률 (%)": f"{row['observed_percentage']:.6f}%",
+                        "신뢰구간 (%)": f"{row['ci_low_percentage']:.6f}% ~ {row['ci_high_percentage']:.6f}%",
+                        "z": f"{row['z']:.2f}",
+                        "이상": "⚠️" if row["flagged"] else "",
+                    })
+                st.dataframe(pd.DataFrame(sim_data), use_container_width=True)
+
+                if report["p_value"] < 0.001:
+                    st.warning(f"⚠️ 카이제곱 검정 실패: χ²={report['chi_square']:.2f}, "
+                               f"자유도={report['dof']}, p={report['p_value']:.4g}")
+                else:
+                    st.success(f"✅ 카이제곱 검정 통과: χ²={report['chi_square']:.2f}, "
+                               f"자유도={report['dof']}, p={report['p_value']:.4g}")
+
+            # 목표 확률에 맞춘 재배분 (what-if)
+            st.subheader("🎛️ 목표 확률 맞추기")
+            st.caption("목표 전체 확률을 지정한 아이템은 그 값에 맞추고, 고정하지 않은 나머지 아이템은 "
+                       "현재 비율을 유지한 채 남은 확률을 나눕니다. 최소/최대는 전체 확률 기준입니다.")
+            constraints = st.data_editor(
+                pd.DataFrame({
+                    "아이템 ID": pd.Series(dtype=str),
+                    "목표 전체 확률 (%)": pd.Series(dtype=float),
+                    "최소 (%)": pd.Series(dtype=float),
+                    "최대 (%)": pd.Series(dtype=float),
+                    "고정": pd.Series(dtype=bool),
+                }),
+                num_rows="dynamic",
+                use_container_width=True,
+                hide_index=True,
+                key="rebalance_constraints"
+            )
+
+            if st.button("재배분 계산"):
+                from drop_rebalancer import DropRebalancer
+
+                rows = constraints.dropna(subset=["아이템 ID"]).drop_duplicates("아이템 ID", keep="last")
+                unknown = [item_id for item_id in rows["아이템 ID"] if item_id not in model.items]
+                if unknown:
+                    st.error(f"없는 아이템 ID입니다: {', '.join(map(str, unknown[:10]))}")
+                else:
+                    rows = rows.set_index("아이템 ID")
+                    scale = converter.MAX_PROBABILITY / 100
+                    catalog = pd.DataFrame({
+                        "group_id": 0,
+                        "group_total": group_total,
+                        "item_id": item_ids,
+                        "item_percentage": percentages,
+                    })
+                    catalog["target_probability"] = catalog["item_id"].map(rows["목표 전체 확률 (%)"]) * scale
+                    catalog["min_probability"] = catalog["item_id"].map(rows["최소 (%)"]) * scale
+                    catalog["max_probability"] = catalog["item_id"].map(rows["최대 (%)"]) * scale
+                    catalog["fixed"] = catalog["item_id"].map(rows["고정"]).fillna(False).astype(bool)
+
+                    rebalancer = DropRebalancer(converter)
+                    with profiler.span("rebalance"):
+                        solution = rebalancer.solve(catalog)
+                    st.session_state['rebalance'] = (model.key, solution, bool(rebalancer.infeasible_groups))
+
+            rebalance = st.session_state.get('rebalance')
+            if rebalance is not None and rebalance[0] == model.key:
+                _, solution, infeasible = rebalance
+                if infeasible:
+                    st.warning("⚠️ 최소/최대 범위를 모두 만족하도록 배분할 수 없어 범위에 가장 가까운 값으로 계산했습니다. "
+                               "합계가 그룹 전체 확률과 달라 적용할 수 없으니 범위를 조정해 다시 계산하세요.")
+
+                # item_probability는 현재 표와 같은 방식으로 계산한 값
+                current_parts = solution["item_probability"].to_numpy()
+                new_parts = solution["new_probability"].to_numpy()
+                diff = new_parts - current_parts
+                changed = np.flatnonzero(diff)
+                target_error = (solution["new_probability"] - solution["target_probability"]).abs().max()
+                col_changed, col_error = st.columns([1, 1])
+                with col_changed:
+                    st.metric("바뀌는 아이템", f"{len(changed):,}개")
+                with col_error:
+                    st.metric(f"목표와의 최대 차이 ({converter.scale_name})",
+                              "-" if np.isnan(target_error) else f"{int(target_error):,}")
+
+                if len(changed) == 0:
+                    st.info("현재 표와 달라지는 아이템이 없습니다.")
+                else:
+                    # 변화가 큰 아이템부터 최대 500개만 표시
+                    shown = changed[np.argsort(-np.abs(diff[changed]), kind="stable")][:500]
+                    new_percentages = solution["new_percentage"].to_numpy()
+                    st.dataframe(pd.DataFrame({
+                        "아이템 ID": [item_ids[i] for i in shown],
+                        "현재 그룹 내 (%)": [f"{prob:.4f}%" for prob in percentages[shown]],
+                        "변경 그룹 내 (%)": [f"{prob:.4f}%" for prob in new_percentages[shown]],
+                        f"현재 전체 ({converter.scale_name})": [f"{part:,}" for part in current_parts[shown].tolist()],
+                        f"변경 전체 ({converter.scale_name})": [f"{part:,}" for part in new_parts[shown].tolist()],
+                        "차이": [f"{change:+,}" for change in diff[shown].tolist()],
+                    }), use_container_width=True, hide_index=True)
+                    if len(changed) > len(shown):
+                        st.caption(f"변화가 큰 {len(shown):,}개만 표시합니다. (전체 {len(changed):,}개)")
+
+                    # 범위를 만족할 수 없는 결과는 그룹 내 확률 합이 100%가 아니므로 적용하지 않음
+                    if st.button("재배분 결과 적용", type="primary", disabled=infeasible):
+                        model.replace_items(zip(item_ids, new_percentages.tolist()))
+                        del st.session_state['rebalance']
+                        st.rerun()
         else:
             st.info("아이템을 추가하여 계산을 시작하세요.")
 
 
 if __name__ == "__main__":
-    main()
+    with profiler.rerun("probability"):
+        main()
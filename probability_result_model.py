@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from drop_table_compiler import DropTableCompiler
+from rerun_profiler import profiler
+
+
+class ProbabilityResultModel:
+    """
+    Streamlit 재실행 사이에 유지되는 계산 결과 모델
+
+    아이템 추가/삭제 시 해당 아이템만 다시 계산하고 합계를 갱신하며,
+    테이블/차트처럼 전체 아이템에 의존하는 결과는 (group_total, 아이템 집합 해시) 키로 메모이즈합니다.
+    """
+
+    def __init__(self, converter, group_total=0):
+        self.converter = converter
+        self.compiler = DropTableCompiler(converter.MAX_PROBABILITY)
+        self.group_total = group_total
+        self.items = {}        # {아이템_id: 그룹내_확률(백분율)}
+        self.parts = {}        # {아이템_id: 전체_확률} (calculate_item_probability와 같은 절사 방식)
+        self.total_parts = 0
+        self.percentage_sum = 0.0
+        self.items_hash = 0
+        self._memo = {}
+
+    @property
+    def key(self):
+        """현재 계산 상태를 나타내는 키 (아이템 집합 해시는 순서와 무관하게 XOR로 누적)"""
+        return self.group_total, self.items_hash, len(self.items)
+
+    def set_group_total(self, group_total):
+        """그룹 전체 확률이 바뀌면 모든 아이템을 한 번의 벡터 연산으로 다시 계산"""
+        if group_total == self.group_total:
+            return
+        self.group_total = group_total
+        self._recalculate()
+
+    def replace_items(self, items):
+        """아이템 목록 전체를 교체 (파일 가져오기 등)"""
+        self.items = dict(items)
+        self.items_hash = 0
+        self.percentage_sum = 0.0
+        for item_id, percentage in self.items.items():
+            self.items_hash ^= hash((item_id, percentage))
+            self.percentage_sum += percentage
+        self._recalculate()
+
+    def _recalculate(self):
+        item_ids = list(self.items)
+        if item_ids:
+            parts = self.converter.calculate_batch(self.group_total, list(self.items.values())).tolist()
+        else:
+            parts = []
+        self.parts = dict(zip(item_ids, parts))
+        self.total_parts = sum(parts)
+
+    def add_item(self, item_id, percentage):
+        part = self.converter.calculate_item_probability(self.group_total, percentage)
+        self.items[item_id] = percentage
+        self.parts[item_id] = part
+        self.total_parts += part
+        self.percentage_sum += percentage
+        self.items_hash ^= hash((item_id, percentage))
+
+    def remove_item(self, item_id):
+        percentage = self.items.pop(item_id)
+        self.total_parts -= self.parts.pop(item_id)
+        self.percentage_sum -= percentage
+        self.items_hash ^= hash((item_id, percentage))
+        if not self.items:
+            # 부동소수점 누적 오차 제거
+            self.percentage_sum = 0.0
+
+    def clear(self):
+        self.items = {}
+        self.parts = {}
+        self.total_parts = 0
+        self.percentage_sum = 0.0
+        self.items_hash = 0
+        self._memo = {}
+
+    def validate(self):
+        """validate_percentages와 같은 기준으로 누적 합계를 검증"""
+        return self.converter.validate_percentages({"합계": self.percentage_sum})
+
+    def results(self):
+        """
+        아이템별 전체 확률
+
+        합이 100%이면 정수 배분 결과(합계가 그룹 확률과 정확히 일치)를, 아니면 절사 결과를 반환합니다.
+        """
+        is_valid, _ = self.validate()
+        if not is_valid:
+            return self.parts
+        return self.memoize("exact", lambda: self.compiler.calculate_multiple_items(self.group_total, self.items))
+
+    def results_total(self):
+        is_valid, _ = self.validate()
+        return self.group_total if is_valid else self.total_parts
+
+    def memoize(self, name, builder):
+        """현재 키에서 name으로 만든 값이 있으면 재사용하고, 없으면 builder()로 만들어 저장"""
+        key = self.key
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == key:
+            profiler.count("memo_hit")
+            return cached[1]
+        profiler.count("memo_miss")
+        value = builder()
+        self._memo[name] = (key, value)
+        return value
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streamlit 재실행 단위 프로파일러
+
+APP_PROFILE=1 환경 변수로 켜면 재실행마다 구간별 소요 시간(span)과 카운터(파일 읽기/쓰기, 캐시 적중 등)를
+모아 APP_PROFILE_PATH(기본값: profile.jsonl)에 JSONL 한 줄로 기록하고, 최근 기록을 디버그 패널용으로 보관합니다.
+꺼져 있으면 span()은 공유 no-op 컨텍스트를, count()는 바로 반환하므로 오버헤드가 거의 없습니다.
+
+    with profiler.rerun("probability"):
+        with profiler.span("calculate"):
+            ...
+        profiler.count("file_read")
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+_NOOP = nullcontext()
+
+
+class _Span:
+    __slots__ = ("record", "name", "start")
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        spans = self.record["spans"]
+        spans[self.name] = spans.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _Rerun:
+    def __init__(self, profiler, app):
+        self.profiler = profiler
+        self.app = app
+
+    def __enter__(self):
+        self.record = {
+            "app": self.app,
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "spans": {},
+            "counters": {},
+        }
+        self.start = time.perf_counter()
+        self.profiler._local.record = self.record
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["total_ms"] = round((time.perf_counter() - self.start) * 1000, 3)
+        self.record["spans"] = {name: round(ms, 3) for name, ms in self.record["spans"].items()}
+        if exc_type is not None:
+            # st.rerun()은 예외로 구현되어 있으므로 오류와 구분해 기록
+            self.record["exit"] = exc_type.__name__
+        self.profiler._local.record = None
+        self.profiler._finish(self.record)
+        return False
+
+
+class RerunProfiler:
+    def __init__(self, enabled=False, path="profile.jsonl", keep=50):
+        self.enabled = enabled
+        self.path = path
+        self.recent = deque(maxlen=keep)
+        self._local = threading.local()  # Streamlit 세션은 각자 다른 스레드에서 실행됨
+        self._lock = threading.Lock()
+
+    def rerun(self, app):
+        """재실행 하나를 기록하는 컨텍스트"""
+        if not self.enabled:
+            return _NOOP
+        return _Rerun(self, app)
+
+    def _current(self):
+        return getattr(self._local, "record", None)
+
+    def span(self, name):
+        """현재 재실행 안에서 name 구간의 소요 시간을 누적 (같은 이름은 합산)"""
+        if not self.enabled:
+            return _NOOP
+        record = self._current()
+        if record is None:
+            return _NOOP
+        return _Span(record, name)
+
+    def count(self, name, value=1):
+        """현재 재실행의 name 카운터 증가"""
+        if not self.enabled:
+            return
+        record = self._current()
+        if record is not None:
+            counters = record["counters"]
+            counters[name] = counters.get(name, 0) + value
+
+    def _finish(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.recent.append(record)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+
+    def last(self, n, app=None):
+        """최근 n개의 재실행 기록 (최신순)"""
+        with self._lock:
+            records = [record for record in reversed(self.recent) if app is None or record["app"] == app]
+        return records[:n]
+
+
+profiler = RerunProfiler(
+    enabled=os.environ.get("APP_PROFILE", "") not in ("", "0"),
+    path=os.environ.get("APP_PROFILE_PATH", "profile.jsonl"),
+)
+
+
+def show_debug_panel(app, n=10):
+    """사이드바에 최근 n개 재실행의 구간별 소요 시간과 카운터를 표시 (프로파일러가 켜져 있을 때만)"""
+    if not profiler.enabled:
+        return
+    import streamlit as st
+
+    with st.sidebar.expander("🛠️ 디버그: 최근 재실행"):
+        rows = []
+        for record in profiler.last(n, app):
+            row = {"시각": record["ts"][11:], "전체 (ms)": round(record["total_ms"], 1)}
+            row.update({f"{name} (ms)": round(ms, 1) for name, ms in record["spans"].items()})
+            row.update(record["counters"])
+            rows.append(row)
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+        else:
+            st.caption("아직 기록된 재실행이 없습니다.")
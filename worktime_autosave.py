@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import atexit
+import threading
+import time
+from datetime import datetime
+
+from rerun_profiler import profiler
+
+
+class _Pending:
+    __slots__ = ("work_times", "week_minutes", "first_at", "due")
+
+    def __init__(self, work_times, week_minutes, first_at, due):
+        self.work_times = work_times
+        self.week_minutes = week_minutes
+        self.first_at = first_at
+        self.due = due
+
+
+class AutosaveWriter:
+    """
+    근무시간 자동 저장 (백그라운드 스레드)
+
+    submit()은 (사용자, 주차)별 최신 입력만 메모리에 남기고 바로 반환하므로 입력 중인 화면이 디스크를 기다리지 않습니다.
+    마지막 입력 후 delay초 동안 추가 입력이 없으면(계속 입력 중이어도 첫 입력 후 max_delay초가 지나면)
+    백그라운드 스레드가 한 번만 저장하고, 프로세스 종료 시(atexit) 남은 입력을 모두 저장합니다.
+    """
+
+    def __init__(self, storage, summary=None, delay=2.0, max_delay=10.0):
+        """
+        Args:
+            storage: save(username, week_label, work_times)를 제공하는 저장소
+            summary (WeeklySummaryIndex): 저장 후 주간 요약도 갱신할 인덱스 (없으면 생략)
+            delay (float): 마지막 입력 후 저장까지 기다리는 시간(초)
+            max_delay (float): 첫 입력 후 저장을 미룰 수 있는 최대 시간(초)
+        """
+        self.storage = storage
+        self.summary = summary
+        self.delay = delay
+        self.max_delay = max_delay
+        self.writes = 0
+        self.coalesced = 0
+        self._pending = {}       # {(사용자, 주차): _Pending}
+        self._saved_at = {}      # {(사용자, 주차): 마지막 저장 시각}
+        self._errors = {}        # {(사용자, 주차): 마지막 저장 오류 메시지}
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # 백그라운드 저장과 즉시 저장(flush)이 같은 키를 순서대로 쓰도록 보장
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="worktime-autosave", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, username, week_label, work_times, week_minutes=None):
+        """
+        저장할 입력을 등록 (디스크에 쓰지 않고 바로 반환)
+
+        같은 (사용자, 주차)에 아직 저장되지 않은 입력이 있으면 새 입력으로 교체합니다.
+        """
+        key = (username, week_label)
+        # 호출한 쪽이 이후에 session_state를 수정해도 등록된 입력이 바뀌지 않도록 복사
+        work_times = {day: dict(times) for day, times in work_times.items()}
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("자동 저장이 이미 종료되었습니다.")
+            pending = self._pending.get(key)
+            first_at = now if pending is None else pending.first_at
+            if pending is not None:
+                self.coalesced += 1
+            self._pending[key] = _Pending(work_times, week_minutes, first_at,
+                                          min(now + self.delay, first_at + self.max_delay))
+            self._condition.notify()
+        profiler.count("autosave_queued")
+
+    def discard(self, username, week_label):
+        """아직 저장되지 않은 입력을 버림 (삭제한 주차가 다시 저장되지 않도록)"""
+        with self._write_lock, self._condition:
+            self._pending.pop((username, week_label), None)
+
+    def flush(self, username=None):
+        """
+        대기 중인 입력을 호출한 스레드에서 바로 저장 (username을 주면 그 사용자만)
+
+        Returns:
+            bool: 모두 저장에 성공했으면 True
+        """
+        return self._write_due(lambda key, pending: username is None or key[0] == username, retry=False)
+
+    def status(self, username, week_label):
+        """
+        Returns:
+            dict: {"pending": 저장 대기 여부, "saved_at": 마지막 저장 시각(datetime 또는 None),
+                   "error": 마지막 저장 오류 메시지(없으면 None)}
+        """
+        key = (username, week_label)
+        with self._condition:
+            return {
+                "pending": key in self._pending,
+                "saved_at": self._saved_at.get(key),
+                "error": self._errors.get(key),
+            }
+
+    def close(self):
+        """백그라운드 스레드를 멈추고 남은 입력을 모두 저장"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+                    timeout = min(pending.due for pending in self._pending.values()) - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            now = time.monotonic()
+            self._write_due(lambda key, pending: pending.due <= now, retry=True)
+
+    def _write_due(self, selector, retry):
+        success = True
+        with self._write_lock:
+            with self._condition:
+                keys = [key for key, pending in self._pending.items() if selector(key, pending)]
+                batch = [(key, self._pending.pop(key)) for key in keys]
+            for (username, week_label), pending in batch:
+                try:
+                    self.storage.save(username, week_label, pending.work_times)
+                    if self.summary is not None and pending.week_minutes is not None:
+                        self.summary.update(username, week_label, pending.week_minutes)
+                except Exception as e:
+                    success = False
+                    with self._condition:
+                        self._errors[(username, week_label)] = str(e)
+                        # 그 사이 새 입력이 없으면 delay 후 다시 시도
+                        if retry and not self._closed and (username, week_label) not in self._pending:
+                            now = time.monotonic()
+                            self._pending[(username, week_label)] = _Pending(
+                                pending.work_times, pending.week_minutes, now, now + self.delay)
+                else:
+                    with self._condition:
+                        self.writes += 1
+                        self._saved_at[(username, week_label)] = datetime.now()
+                        self._errors.pop((username, week_label), None)
+        return success
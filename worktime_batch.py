@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+근무시간 배치 계산 (Streamlit 없이 실행)
+
+(user, date, start, end) 출퇴근 기록 CSV / JSONL을 청크 단위로 스트리밍하면서
+프로세스 풀에서 근무 분을 계산하고, 사용자별 주간 합계를 CSV / JSONL로 저장합니다.
+
+    python worktime_batch.py punches.csv weekly.csv --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+
+from worktime_calculator import WorkTimeCalculator
+from worktime_weeks import week_key
+
+FIELDS = ("user", "date", "start", "end")
+
+# 워커 프로세스마다 한 번만 만드는 계산기
+_worker_calculator = None
+
+
+def _init_worker(break_policy):
+    global _worker_calculator
+    _worker_calculator = WorkTimeCalculator(break_policy)
+
+
+@lru_cache(maxsize=4096)
+def _date_to_week_key(value):
+    try:
+        return week_key(date.fromisoformat(value.strip()))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _aggregate_chunk(rows):
+    """
+    워커: 청크의 근무 분을 한 번에 계산하고 (사용자, 주차)별로 합산
+
+    Returns:
+        tuple: ({(사용자, 주차): [근무_분, 근무한 날짜 집합]}, 잘못된 행 수)
+    """
+    minutes = _worker_calculator.calculate_day_minutes_batch(
+        [row[2] for row in rows], [row[3] for row in rows]
+    ).tolist()
+    totals = {}
+    invalid = 0
+    for (user, day, _, _), worked in zip(rows, minutes):
+        week = _date_to_week_key(day)
+        if not user or week is None:
+            invalid += 1
+            continue
+        total = totals.setdefault((user, week), [0, set()])
+        total[0] += worked
+        # 같은 날의 분할 근무/중복 기록은 하루로, 근무 시간이 0인 기록은 근무일에서 제외
+        if worked > 0:
+            total[1].add(day.strip())
+    return totals, invalid
+
+
+def detect_format(path, file_format=None):
+    if file_format:
+        return file_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {path}")
+
+
+def iter_punches(path, file_format=None):
+    """출퇴근 기록을 (user, date, start, end) 튜플로 한 줄씩 읽기"""
+    file_format = detect_format(path, file_format)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if file_format == "csv":
+            for record in csv.DictReader(f):
+                yield tuple(record.get(field) or '' for field in FIELDS)
+        else:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield tuple(str(record.get(field) or '') for field in FIELDS)
+
+
+def write_weekly(path, totals, calculator, file_format=None):
+    """사용자별 주간 합계를 (user, week, minutes, hours, days) 형식으로 저장 (days: 근무한 날짜 수)"""
+    file_format = detect_format(path, file_format)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f) if file_format == "csv" else None
+        if writer:
+            writer.writerow(["user", "week", "minutes", "hours", "days"])
+        for (user, week), (minutes, days) in sorted(totals.items()):
+            row = [user, week, minutes, calculator.minutes_to_hours(minutes), len(days)]
+            if writer:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(dict(zip(["user", "week", "minutes", "hours", "days"], row)),
+                                   ensure_ascii=False) + "\n")
+
+
+def run(input_path, output_path, workers=None, chunk_size=100000, input_format=None, output_format=None):
+    """
+    배치 계산 실행
+
+    동시에 처리 중인 청크 수를 workers * 2개로 제한하므로, 입력 크기와 무관하게
+    메모리 사용량은 청크 크기와 (사용자, 주차) 수에만 비례합니다.
+
+    Returns:
+        dict: rows, invalid_rows, weeks, elapsed, rows_per_sec
+    """
+    calculator = WorkTimeCalculator()
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    totals = {}
+    rows = 0
+    invalid_rows = 0
+
+    def merge(future):
+        nonlocal invalid_rows
+        chunk_totals, chunk_invalid = future.result()
+        invalid_rows += chunk_invalid
+        for key, (minutes, days) in chunk_totals.items():
+            total = totals.setdefault(key, [0, set()])
+            total[0] += minutes
+            total[1] |= days
+
+    punches = iter_punches(input_path, input_format)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(calculator.break_policy,)) as executor:
+        pending = set()
+        while True:
+            chunk = list(islice(punches, chunk_size))
+            if not chunk:
+                break
+            rows += len(chunk)
+            pending.add(executor.submit(_aggregate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(future)
+        for future in pending:
+            merge(future)
+
+    write_weekly(output_path, totals, calculator, output_format)
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "invalid_rows": invalid_rows,
+        "weeks": len(totals),
+        "elapsed": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="출퇴근 기록으로 사용자별 주간 근무시간을 계산합니다.")
+    parser.add_argument("input", help="출퇴근 기록 파일 (.csv / .jsonl, 컬럼: user, date, start, end)")
+    parser.add_argument("output", help="주간 합계 파일 (.csv / .jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="청크당 행 수")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="입력 형식 (기본값: 확장자로 판별)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="출력 형식 (기본값: 확장자로 판별)")
+    args = parser.parse_args(argv)
+
+    stats = run(args.input, args.output, args.workers, args.chunk_size, args.input_format, args.output_format)
+    print(
+        f"{stats['rows']:,}행 처리 (잘못된 행 {stats['invalid_rows']:,}), "
+        f"{stats['weeks']:,}개 (사용자, 주차), {stats['elapsed']:.2f}초, "
+        f"{stats['rows_per_sec']:,.0f} rows/sec",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+from worktime_policy import BreakPolicy, parse_times
+from worktime_weeks import week_key
+
+# 퇴근 시간이 비어 있으면 이 시각으로 계산
+DEFAULT_END_TIME = '18:30'
+
+
+class WorkTimeCalculator:
+    """Streamlit 없이 사용할 수 있는 근무시간 계산 (웹 앱과 배치 CLI가 공유)"""
+
+    def __init__(self, break_policy=None):
+        self.days = ['월요일', '화요일', '수요일', '목요일', '금요일']
+        self.break_policy = break_policy or BreakPolicy()
+
+    def calculate_work_hours(self, start_time, end_time):
+        return self.break_policy.calculate_work_hours(start_time, end_time)
+
+    def calculate_day_minutes(self, start_time, end_time):
+        # If end_time is not provided, use default 18:30 for calculation
+        calc_end_time = end_time if (end_time and str(end_time).strip()) else DEFAULT_END_TIME
+        return self.calculate_work_hours(start_time, calc_end_time)
+
+    def calculate_day_minutes_batch(self, start_times, end_times):
+        """calculate_day_minutes의 벡터화 버전 ("HH:MM" 문자열 목록 -> np.ndarray)"""
+        calc_end_times = [
+            end_time if (end_time and str(end_time).strip()) else DEFAULT_END_TIME for end_time in end_times
+        ]
+        return self.break_policy.worked_minutes_batch(parse_times(start_times), parse_times(calc_end_times))
+
+    def calculate_week_minutes(self, work_times):
+        return sum(
+            self.calculate_day_minutes(work_times.get(day, {}).get('start', ''), work_times.get(day, {}).get('end', ''))
+            for day in self.days
+        )
+
+    def minutes_to_hours(self, minutes):
+        return round(minutes / 60, 2)
+
+    def get_current_week_key(self):
+        """이번 주 월요일 날짜("YYYY-MM-DD")를 주차 키로 반환합니다."""
+        return week_key(datetime.now())
@@ -1,8 +1,13 @@
 import streamlit as st
 import os
-import json
-import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from rerun_profiler import profiler, show_debug_panel
+from worktime_autosave import AutosaveWriter
+from worktime_calculator import WorkTimeCalculator
+from worktime_storage import CachedWorkTimeStorage, create_storage
+from worktime_summary import WeeklySummaryIndex
+from worktime_weeks import format_week_label, last_weeks_range, quarter_range
 
 # --- 0. 사용자 목록 정의 (9명) ---
 USER_LIST = ["이주호", "황인섭", "최태경", "김시우", "윤석준", "오진호", "김효민", "윤현준", "김재민", "조민재", "권영준"]
@@ -13,104 +18,153 @@ if 'selected_user' not in st.session_state:
     st.session_state.selected_user = USER_LIST[0]
 if 'work_times' not in st.session_state:
     st.session_state.work_times = {}
+if 'autosave_dirty' not in st.session_state:
+    st.session_state.autosave_dirty = False
+# work_times를 불러온 (사용자, 주차): 이 주차가 이번 주일 때만 자동 저장
+if 'loaded_week' not in st.session_state:
+    st.session_state.loaded_week = None
 # -----------------------------------------------
 
-class WorkTimeCalculatorStreamlit:
-    def __init__(self):
-        self.days = ['월요일', '화요일', '수요일', '목요일', '금요일']
+@st.cache_resource
+def get_shared_storage(data_dir):
+    """모든 세션이 공유하는 저장소와 읽기 캐시 (프로세스당 하나)"""
+    return CachedWorkTimeStorage(create_storage(data_dir))
+
+
+@st.cache_resource
+def get_shared_summary(data_dir):
+    """모든 세션이 공유하는 주간 요약 인덱스 (프로세스당 하나)"""
+    return WeeklySummaryIndex(os.path.join(data_dir, "weekly_summary.db"))
+
+
+@st.cache_resource
+def get_shared_autosave(data_dir):
+    """모든 세션이 공유하는 자동 저장 스레드 (프로세스당 하나)"""
+    return AutosaveWriter(get_shared_storage(data_dir), get_shared_summary(data_dir))
+
+
+def load_week(calculator, username, week_label):
+    """사용자의 주차 기록을 입력 화면으로 불러옴 (기록이 없으면 빈 입력)"""
+    # 아직 저장되지 않은 자동 저장 입력도 반영되도록 먼저 저장
+    calculator.autosave.flush(username)
+    saved = calculator.load_data_from_file(username).get(week_label)
+    st.session_state.work_times = saved or {day: {'start': '', 'end': ''} for day in calculator.days}
+    st.session_state.loaded_week = (username, week_label)
+
+
+def mark_autosave_dirty():
+    """출근/퇴근 입력이 바뀌었을 때만 자동 저장하도록 표시 (불러오기만 한 데이터는 저장하지 않음)"""
+    st.session_state.autosave_dirty = True
+
+
+class WorkTimeCalculatorStreamlit(WorkTimeCalculator):
+    def __init__(self, storage=None, break_policy=None, summary=None, autosave=None):
+        super().__init__(break_policy)
         self.data_dir = 'user_data'
         self.ensure_data_directory()
+        self.storage = storage or get_shared_storage(self.data_dir)
+        self.summary = summary or get_shared_summary(self.data_dir)
+        self.autosave = autosave or get_shared_autosave(self.data_dir)
+        if self.summary.needs_rebuild():
+            self.rebuild_summary()
 
     def ensure_data_directory(self):
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-    def get_user_data_file(self, username):
-        filename = f"worktime_data_{username}.json"
-        return os.path.join(self.data_dir, filename)
-
     def load_data_from_file(self, username):
-        data_file = self.get_user_data_file(username)
         try:
-            if os.path.exists(data_file):
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
+            with profiler.span("storage_load"):
+                return self.storage.load(username)
         except Exception as e:
             st.error(f"데이터 로드 중 오류가 발생했습니다: {e}")
             return {}
 
+    def autosave_work_times(self, username, work_times, week_label):
+        """입력 내용을 자동 저장 대기열에 등록 (디스크에 쓰지 않고 바로 반환)"""
+        try:
+            self.autosave.submit(username, week_label, work_times, self.calculate_week_minutes(work_times))
+        except Exception as e:
+            st.error(f"자동 저장 중 오류가 발생했습니다: {e}")
+
     def save_data_to_file(self, username, work_times, week_label):
-        data_file = self.get_user_data_file(username)
         try:
-            if os.path.exists(data_file):
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    saved_data = json.load(f)
-            else:
-                saved_data = {}
-            saved_data[week_label] = work_times
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(saved_data, f, ensure_ascii=False, indent=2)
+            with profiler.span("storage_save"):
+                # 대기 중인 자동 저장이 이 저장보다 늦게 쓰여 새 입력을 덮어쓰지 않도록 먼저 버림
+                self.autosave.discard(username, week_label)
+                self.storage.save(username, week_label, work_times)
+                self.summary.update(username, week_label, self.calculate_week_minutes(work_times))
             return True
         except Exception as e:
             st.error(f"데이터 저장 중 오류가 발생했습니다: {e}")
             return False
 
-    def get_saved_dates(self, username):
-        data = self.load_data_from_file(username)
-        return sorted(list(data.keys())) if data else []
+    def delete_data_from_file(self, username, week_label):
+        try:
+            with profiler.span("storage_save"):
+                self.autosave.discard(username, week_label)
+                deleted = self.storage.delete(username, week_label)
+                self.summary.delete(username, week_label)
+            return deleted
+        except Exception as e:
+            st.error(f"데이터 삭제 중 오류가 발생했습니다: {e}")
+            return False
 
-    def calculate_work_hours(self, start_time, end_time):
-        if not start_time or not end_time: return 0
+    def get_saved_dates(self, username):
         try:
-            start_hour, start_minute = map(int, start_time.split(':'))
-            end_hour, end_minute = map(int, end_time.split(':'))
-            start_minutes = start_hour * 60 + start_minute
-            end_minutes = end_hour * 60 + end_minute
-            
-            if start_minutes >= end_minutes: return 0
-            
-            total_minutes = end_minutes - start_minutes
-            lunch_start = 12 * 60 + 30
-            lunch_end = 13 * 60 + 30
-            if start_minutes < lunch_end and end_minutes > lunch_start:
-                # subtract the overlap with lunch (max 60 minutes)
-                overlap = min(end_minutes, lunch_end) - max(start_minutes, lunch_start)
-                total_minutes -= max(0, min(overlap, 60))
-
-            dinner_start = 18 * 60 + 30
-            dinner_end = 19 * 60 + 30
-            if start_minutes < dinner_end and end_minutes > dinner_start:
-                # subtract the overlap with dinner (max 60 minutes)
-                overlap = min(end_minutes, dinner_end) - max(start_minutes, dinner_start)
-                total_minutes -= max(0, min(overlap, 60))
-            
-            return max(0, total_minutes)
-        except (ValueError, IndexError):
-            return 0
-
-    def minutes_to_hours(self, minutes):
-        return round(minutes / 60, 2)
-
-    def get_current_week_label(self):
-        """ISO 주차 계산 방식을 사용하여 정확한 주차를 반환합니다."""
-        today = datetime.now()
-        # 해당 월의 첫 날
-        first_day_of_month = today.replace(day=1)
-        
-        # 첫 날의 주차 번호
-        first_week_number = first_day_of_month.isocalendar()[1]
-        
-        # 현재 날짜의 주차 번호
-        current_week_number = today.isocalendar()[1]
-        
-        # 월이 바뀌면서 주차가 줄어드는 경우 (예: 1월 1일이 포함된 주가 전년도 주차인 경우) 보정
-        if first_week_number > current_week_number and today.month == 1:
-            week_number = current_week_number
-        else:
-            week_number = current_week_number - first_week_number + 1
-
-        return f"{today.month}월 {week_number}주차"
+            with profiler.span("storage_load"):
+                return self.storage.weeks(username)
+        except Exception as e:
+            st.error(f"데이터 로드 중 오류가 발생했습니다: {e}")
+            return []
+
+    def rebuild_summary(self):
+        """원본 기록에서 팀 현황용 주간 요약을 다시 생성"""
+        return self.summary.rebuild(self.storage, USER_LIST, self.calculate_week_minutes)
+
+
+def show_team_overview(calculator):
+    st.title("팀 근무시간 현황")
+
+    period = st.radio("기간", ["최근 12주", "이번 분기", "전체"], horizontal=True)
+    today = datetime.now().date()
+    if period == "최근 12주":
+        start_key, end_key = last_weeks_range(12, today)
+    elif period == "이번 분기":
+        start_key, end_key = quarter_range(today)
+    else:
+        start_key, end_key = None, None
+
+    with profiler.span("storage_load"):
+        summary = calculator.summary.load_all(start_key, end_key)
+    if not summary:
+        st.info("저장된 근무시간 데이터가 없습니다.")
+    else:
+        # pandas는 팀 현황 표를 그릴 때만 필요
+        import pandas as pd
+
+        # 사용자 x 주차 근무시간 행렬 (요약 인덱스만 읽으므로 원본 기록 길이와 무관)
+        with profiler.span("dataframe"):
+            df_minutes = pd.DataFrame(summary).T.reindex(index=[user for user in USER_LIST if user in summary] +
+                                                         [user for user in summary if user not in USER_LIST])
+            df_minutes = df_minutes[sorted(df_minutes.columns)].rename(columns=format_week_label)
+            df_hours = (df_minutes / 60).round(2)
+            df_hours["합계"] = (df_minutes.sum(axis=1) / 60).round(2)
+            df_hours["평균"] = (df_minutes.mean(axis=1) / 60).round(2)
+            df_hours.loc["합계"] = (df_minutes.sum(axis=0) / 60).round(2)
+            df_hours.loc["합계", "합계"] = round(df_minutes.sum().sum() / 60, 2)
+            # 합계 행의 평균은 팀 주간 합계의 주 평균
+            df_hours.loc["합계", "평균"] = round(df_minutes.sum(axis=0).mean() / 60, 2)
+        st.dataframe(df_hours, use_container_width=True)
+
+        st.markdown("### 주차별 추이")
+        st.line_chart((df_minutes / 60).round(2).T)
+
+    if st.button("요약 다시 만들기", type="secondary"):
+        weeks = calculator.rebuild_summary()
+        st.success(f"{weeks}개 주차의 요약을 다시 만들었습니다.")
+        st.rerun()
+
 
 def main():
     st.set_page_config(
@@ -119,7 +173,16 @@ def main():
         layout="centered"
     )
     
-    calculator = WorkTimeCalculatorStreamlit()
+    with profiler.span("init"):
+        calculator = WorkTimeCalculatorStreamlit()
+    show_debug_panel("worktime")
+    if st.session_state.loaded_week is None:
+        load_week(calculator, st.session_state.selected_user, calculator.get_current_week_key())
+
+    page = st.sidebar.radio("화면", ["개인 근무시간", "팀 현황"])
+    if page == "팀 현황":
+        show_team_overview(calculator)
+        return
 
     # --- 2. 3x3 버튼 레이아웃으로 사용자 선택 ---
     st.title("근무시간 계산기")
@@ -129,12 +192,7 @@ def main():
         with cols[i % 3]:
             if st.button(user, key=f"user_btn_{user}", use_container_width=True):
                 st.session_state.selected_user = user
-                saved_data = calculator.load_data_from_file(user)
-                latest_week = max(saved_data.keys(), default=None)
-                if latest_week:
-                    st.session_state.work_times = saved_data[latest_week]
-                else:
-                    st.session_state.work_times = {day: {'start': '', 'end': ''} for day in calculator.days}
+                load_week(calculator, user, calculator.get_current_week_key())
                 st.rerun()
 
     st.success(f"현재 선택된 사용자: **{st.session_state.selected_user}**")
@@ -146,26 +204,22 @@ def main():
     
     with col_load:
         saved_dates = calculator.get_saved_dates(st.session_state.selected_user)
-        selected_date = st.selectbox("불러올 데이터", ["선택하세요"] + saved_dates, key="load_select")
+        selected_date = st.selectbox("불러올 데이터", ["선택하세요"] + saved_dates, key="load_select",
+                                     format_func=format_week_label)
         if selected_date != "선택하세요":
             if st.button("데이터 불러오기", key="load_btn"):
-                saved_data = calculator.load_data_from_file(st.session_state.selected_user)
-                st.session_state.work_times = saved_data.get(selected_date, {})
-                st.success(f"**{selected_date}** 데이터를 불러왔습니다!")
+                load_week(calculator, st.session_state.selected_user, selected_date)
+                st.success(f"**{format_week_label(selected_date)}** 데이터를 불러왔습니다!")
                 st.rerun()
 
     with col_delete:
         saved_dates_delete = calculator.get_saved_dates(st.session_state.selected_user)
-        delete_date = st.selectbox("삭제할 데이터", ["선택하세요"] + saved_dates_delete, key="delete_select")
+        delete_date = st.selectbox("삭제할 데이터", ["선택하세요"] + saved_dates_delete, key="delete_select",
+                                   format_func=format_week_label)
         if delete_date != "선택하세요":
             if st.button("데이터 삭제", type="secondary"):
-                saved_data = calculator.load_data_from_file(st.session_state.selected_user)
-                if delete_date in saved_data:
-                    del saved_data[delete_date]
-                    data_file = calculator.get_user_data_file(st.session_state.selected_user)
-                    with open(data_file, 'w', encoding='utf-8') as f:
-                        json.dump(saved_data, f, ensure_ascii=False, indent=2)
-                    st.success(f"**{delete_date}** 데이터가 삭제되었습니다!")
+                if calculator.delete_data_from_file(st.session_state.selected_user, delete_date):
+                    st.success(f"**{format_week_label(delete_date)}** 데이터가 삭제되었습니다!")
                     st.rerun()
 
     st.markdown("---")
@@ -188,17 +242,17 @@ def main():
         with cols[1]:
             start_key = f"start_{day}"
             start_value = st.session_state.work_times.get(day, {}).get('start', '')
-            start_time = st.text_input("출근시간", value=start_value, key=start_key, placeholder="09:30", label_visibility="collapsed")
+            start_time = st.text_input("출근시간", value=start_value, key=start_key, placeholder="09:30", label_visibility="collapsed",
+                                       on_change=mark_autosave_dirty)
             st.session_state.work_times.setdefault(day, {})['start'] = start_time
         with cols[2]:
             end_key = f"end_{day}"
             end_value = st.session_state.work_times.get(day, {}).get('end', '')
-            end_time = st.text_input("퇴근시간", value=end_value, key=end_key, placeholder="18:30", label_visibility="collapsed")
+            end_time = st.text_input("퇴근시간", value=end_value, key=end_key, placeholder="18:30", label_visibility="collapsed",
+                                     on_change=mark_autosave_dirty)
             st.session_state.work_times.setdefault(day, {})['end'] = end_time
 
-        # If end_time is not provided, use default 18:30 for calculation
-        calc_end_time = end_time if (end_time and str(end_time).strip()) else '18:30'
-        work_minutes = calculator.calculate_work_hours(start_time, calc_end_time)
+        work_minutes = calculator.calculate_day_minutes(start_time, end_time)
         with cols[3]:
             if work_minutes > 0:
                 st.write(f"**{calculator.minutes_to_hours(work_minutes):.2f}시간**")
@@ -209,6 +263,27 @@ def main():
         if i <= today_index:
             today_minutes += work_minutes
 
+    # 입력이 바뀐 재실행에서만 이번 주 데이터로 자동 저장 (저장 버튼과 같은 주차)
+    # 이번 주 기록을 불러온 입력만 저장하여 다른 주차/사용자의 입력이 이번 주 기록을 덮어쓰지 않도록 함
+    current_week = calculator.get_current_week_key()
+    autosave_enabled = st.session_state.loaded_week == (st.session_state.selected_user, current_week)
+    if st.session_state.autosave_dirty:
+        st.session_state.autosave_dirty = False
+        if autosave_enabled:
+            calculator.autosave_work_times(st.session_state.selected_user, st.session_state.work_times, current_week)
+
+    autosave_status = calculator.autosave.status(st.session_state.selected_user, current_week)
+    if not autosave_enabled:
+        st.caption(f"불러온 **{format_week_label(st.session_state.loaded_week[1])}** 데이터는 자동 저장되지 않습니다. "
+                   f"'입력 내용 저장'을 누르면 **{format_week_label(current_week)}** 데이터로 저장됩니다.")
+    elif autosave_status["error"]:
+        st.warning(f"자동 저장에 실패했습니다 (다시 시도 중): {autosave_status['error']}")
+    elif autosave_status["pending"]:
+        st.caption(f"✏️ **{format_week_label(current_week)}** 자동 저장 대기 중...")
+    elif autosave_status["saved_at"]:
+        st.caption(f"💾 **{format_week_label(current_week)}** 자동 저장됨 "
+                   f"({autosave_status['saved_at'].strftime('%H:%M:%S')})")
+
     st.markdown("---")
     
     col_total, col_today = st.columns([1, 1])
@@ -237,10 +312,12 @@ def main():
             st.rerun()
     with col_save:
         if st.button("입력 내용 저장", type="primary"):
-            current_week = calculator.get_current_week_label()
             if calculator.save_data_to_file(st.session_state.selected_user, st.session_state.work_times, current_week):
-                st.success(f"**{st.session_state.selected_user}**님의 **{current_week}** 데이터가 저장되었습니다! 💾")
+                # 저장한 입력은 이번 주 기록이므로 이후 입력은 자동 저장
+                st.session_state.loaded_week = (st.session_state.selected_user, current_week)
+                st.success(f"**{st.session_state.selected_user}**님의 **{format_week_label(current_week)}** 데이터가 저장되었습니다! 💾")
                 st.rerun()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with profiler.rerun("worktime"):
+        main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+
+# NumPy는 배치 계산에서만 필요하므로 worked_minutes_batch / parse_times 안에서 불러옵니다.
+
+MINUTES_PER_DAY = 24 * 60
+
+# 기본 휴게시간: 점심 12:30~13:30, 저녁 18:30~19:30
+DEFAULT_BREAKS = (("12:30", "13:30"), ("18:30", "19:30"))
+
+
+@lru_cache(maxsize=4096)
+def parse_time(value):
+    """"HH:MM" 문자열을 0시 기준 분으로 변환 (형식이 잘못되었으면 None)"""
+    try:
+        hour, minute = map(int, value.split(':'))
+    except (ValueError, AttributeError):
+        return None
+    return hour * 60 + minute
+
+
+class BreakPolicy:
+    """
+    휴게시간 정책을 하루 1440분 누적 근무시간 테이블로 미리 컴파일
+
+    cumulative[m]은 0시부터 m분까지 휴게시간을 뺀 근무 분이므로,
+    임의의 (출근, 퇴근) 근무시간은 테이블 조회 두 번으로 계산됩니다.
+    """
+
+    def __init__(self, breaks=DEFAULT_BREAKS, overnight=False):
+        """
+        Args:
+            breaks (iterable): ("HH:MM", "HH:MM") 휴게시간 목록. 끝이 시작보다 이르면 자정을 넘는 휴게시간입니다.
+            overnight (bool): 퇴근 시각이 출근 시각보다 이르면 다음 날 퇴근(야간 근무)으로 계산할지 여부
+        """
+        self.breaks = tuple(breaks)
+        self.overnight = overnight
+
+        worked = [1] * MINUTES_PER_DAY
+        for break_start, break_end in self.breaks:
+            start, end = parse_time(break_start), parse_time(break_end)
+            if start is None or end is None:
+                raise ValueError(f"잘못된 휴게시간입니다: {break_start}~{break_end}")
+            start %= MINUTES_PER_DAY
+            end %= MINUTES_PER_DAY
+            minutes = range(start, end) if start <= end else [*range(start, MINUTES_PER_DAY), *range(0, end)]
+            for minute in minutes:
+                worked[minute] = 0
+
+        self.cumulative = [0] * (MINUTES_PER_DAY + 1)
+        for minute in range(MINUTES_PER_DAY):
+            self.cumulative[minute + 1] = self.cumulative[minute] + worked[minute]
+        self.minutes_per_day = self.cumulative[MINUTES_PER_DAY]
+        self._cumulative_array = None
+
+    def _worked_until(self, minutes):
+        """0시(첫째 날)부터 minutes분까지의 근무 분 (하루를 넘으면 다음 날에도 같은 정책 적용)"""
+        days, minute = divmod(minutes, MINUTES_PER_DAY)
+        return days * self.minutes_per_day + self.cumulative[minute]
+
+    def worked_minutes(self, start_minutes, end_minutes):
+        """출근/퇴근 시각(분)으로 휴게시간을 뺀 근무 분을 계산"""
+        if start_minutes >= end_minutes:
+            if not self.overnight or start_minutes == end_minutes:
+                return 0
+            end_minutes += MINUTES_PER_DAY
+        return self._worked_until(end_minutes) - self._worked_until(start_minutes)
+
+    def calculate_work_hours(self, start_time, end_time):
+        """"HH:MM" 문자열로 근무 분을 계산 (입력이 비었거나 잘못되었으면 0)"""
+        if not start_time or not end_time:
+            return 0
+        start_minutes, end_minutes = parse_time(start_time), parse_time(end_time)
+        if start_minutes is None or end_minutes is None:
+            return 0
+        return self.worked_minutes(start_minutes, end_minutes)
+
+    def worked_minutes_batch(self, start_minutes, end_minutes):
+        """
+        worked_minutes의 벡터화 버전
+
+        Args:
+            start_minutes (array-like): 출근 시각(분). 음수는 잘못된 입력으로 보고 0분 처리
+            end_minutes (array-like): 퇴근 시각(분). 음수는 잘못된 입력으로 보고 0분 처리
+
+        Returns:
+            np.ndarray: 근무 분 (int64)
+        """
+        import numpy as np
+
+        if self._cumulative_array is None:
+            self._cumulative_array = np.array(self.cumulative, dtype=np.int64)
+
+        starts = np.asarray(start_minutes, dtype=np.int64)
+        ends = np.asarray(end_minutes, dtype=np.int64)
+        valid = (starts >= 0) & (ends >= 0)
+        if self.overnight:
+            ends = np.where((ends < starts) & valid, ends + MINUTES_PER_DAY, ends)
+        valid &= ends > starts
+
+        def worked_until(minutes):
+            days, minute = np.divmod(np.where(valid, minutes, 0), MINUTES_PER_DAY)
+            return days * self.minutes_per_day + self._cumulative_array[minute]
+
+        return np.where(valid, worked_until(ends) - worked_until(starts), 0)
+
+
+def parse_times(values):
+    """"HH:MM" 문자열 배열을 분 배열(np.int64)로 변환 (비었거나 잘못된 값은 -1)"""
+    import numpy as np
+
+    parsed = (parse_time(value) if value else None for value in values)
+    return np.fromiter((-1 if minutes is None else minutes for minutes in parsed), dtype=np.int64)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import glob
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+
+from rerun_profiler import profiler
+from worktime_weeks import WeekIndex, is_week_key, normalize_week_key
+
+JSON_FILE_PREFIX = "worktime_data_"
+
+
+def _modified_date(path):
+    """파일 수정 날짜 (예전 "M월 N주차" 라벨의 연도를 언제 읽어도 같게 추정하는 기준)"""
+    return date.fromtimestamp(os.stat(path).st_mtime)
+
+
+class JsonWorkTimeStorage:
+    """
+    사용자별 JSON 파일 저장소 (기존 방식: 저장할 때마다 파일 전체를 다시 씀)
+
+    임시 파일에 쓴 뒤 이름을 바꿔 교체하므로 저장 도중 종료되어도 파일이 깨지지 않으며,
+    읽기-수정-쓰기는 잠금으로 묶어 같은 프로세스의 동시 저장(자동 저장 스레드 등)이 서로를 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+
+    def get_user_data_file(self, username):
+        filename = f"{JSON_FILE_PREFIX}{username}.json"
+        return os.path.join(self.data_dir, filename)
+
+    def load(self, username):
+        data_file = self.get_user_data_file(username)
+        if os.path.exists(data_file):
+            profiler.count("file_read")
+            modified = _modified_date(data_file)
+            with open(data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 예전 "M월 N주차" 키는 파일 수정 날짜 기준으로 주차 키로 변환 (다음 저장 시 변환된 키로 기록됨)
+            return {normalize_week_key(week, modified): work_times for week, work_times in data.items()}
+        return {}
+
+    def _write(self, username, data):
+        profiler.count("file_write")
+        data_file = self.get_user_data_file(username)
+        temp_path = f"{data_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, data_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def save(self, username, week_label, work_times):
+        with self._lock:
+            data = self.load(username)
+            data[week_label] = work_times
+            self._write(username, data)
+
+    def delete(self, username, week_label):
+        with self._lock:
+            data = self.load(username)
+            if week_label not in data:
+                return False
+            del data[week_label]
+            self._write(username, data)
+            return True
+
+    def weeks(self, username):
+        return sorted(self.load(username).keys())
+
+    def week_index(self, username):
+        return WeekIndex(self.load(username).keys())
+
+    def version(self, username):
+        """사용자 파일이 바뀌었는지 판단하는 값 (수정 시각, 크기)"""
+        try:
+            stat = os.stat(self.get_user_data_file(username))
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+class SqliteWorkTimeStorage:
+    """
+    SQLite 저장소 (기본값)
+
+    (사용자, 주차) 기본키로 한 주 단위 행을 upsert하므로 저장 비용이 기록 길이와 무관하며,
+    트랜잭션과 WAL 모드로 같은 사용자의 여러 세션이 동시에 저장해도 서로의 기록을 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS worktime (
+                    username TEXT NOT NULL,
+                    week TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (username, week)
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def _connect(self):
+        # Streamlit 세션은 각자 다른 스레드에서 실행되므로 작업마다 연결을 새로 엽니다.
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def load(self, username):
+        profiler.count("db_read")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT week, data FROM worktime WHERE username = ? ORDER BY week", (username,)
+            ).fetchall()
+        return {week: json.loads(data) for week, data in rows}
+
+    def save(self, username, week_label, work_times):
+        profiler.count("db_write")
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO worktime (username, week, data) VALUES (?, ?, ?)
+                ON CONFLICT (username, week)
+                DO UPDATE SET data = excluded.data, updated_at = CURRENT_TIMESTAMP
+                """,
+                (username, week_label, json.dumps(work_times, ensure_ascii=False)),
+            )
+
+    def delete(self, username, week_label):
+        profiler.count("db_write")
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "DELETE FROM worktime WHERE username = ? AND week = ?", (username, week_label)
+            )
+            return cursor.rowcount > 0
+
+    def weeks(self, username):
+        profiler.count("db_read")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT week FROM worktime WHERE username = ? ORDER BY week", (username,)
+            ).fetchall()
+        return [week for (week,) in rows]
+
+    def week_index(self, username):
+        # 기본키 (username, week) 인덱스 순서로 읽으므로 이미 정렬되어 있음
+        return WeekIndex(self.weeks(username))
+
+    def version(self, username):
+        """DB가 바뀌었는지 판단하는 값 (DB 및 WAL 파일의 수정 시각, 크기)"""
+        version = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                version.append(None)
+            else:
+                version.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    def migrate_from_json(self, data_dir):
+        """
+        기존 user_data/worktime_data_<사용자>.json 파일을 한 번만 가져오기
+
+        이미 저장된 (사용자, 주차)는 덮어쓰지 않습니다.
+
+        Returns:
+            int: 가져온 주차 수 (이미 가져온 적이 있으면 0)
+        """
+        with closing(self._connect()) as conn, conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return 0
+
+            imported = 0
+            pattern = os.path.join(glob.escape(data_dir), f"{JSON_FILE_PREFIX}*.json")
+            for data_file in sorted(glob.glob(pattern)):
+                username = os.path.basename(data_file)[len(JSON_FILE_PREFIX):-len(".json")]
+                modified = _modified_date(data_file)
+                with open(data_file, 'r', encoding='utf-8') as f:
+                    saved_data = json.load(f)
+                for week_label, work_times in saved_data.items():
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO worktime (username, week, data) VALUES (?, ?, ?)",
+                        (username, normalize_week_key(week_label, modified), json.dumps(work_times, ensure_ascii=False)),
+                    )
+                    imported += cursor.rowcount
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', CURRENT_TIMESTAMP)")
+            return imported
+
+    def migrate_legacy_week_keys(self):
+        """
+        예전 "M월 N주차" 키로 저장된 행을 주차 키(그 주 월요일 날짜)로 변환 (연도는 행의 updated_at 기준으로 추정)
+
+        같은 주차 키가 이미 있으면 기존 행을 유지하고 예전 행은 그대로 둡니다.
+
+        Returns:
+            int: 변환한 행 수
+        """
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute("SELECT username, week, updated_at FROM worktime").fetchall()
+            converted = 0
+            for username, week, updated_at in rows:
+                if is_week_key(week):
+                    continue
+                key = normalize_week_key(week, date.fromisoformat(updated_at[:10]) if updated_at else None)
+                if key != week:
+                    cursor = conn.execute(
+                        "UPDATE OR IGNORE worktime SET week = ? WHERE username = ? AND week = ?",
+                        (key, username, week),
+                    )
+                    converted += cursor.rowcount
+            return converted
+
+
+class CachedWorkTimeStorage:
+    """
+    저장소 앞에 두는 읽기 캐시 (여러 Streamlit 세션이 프로세스 안에서 공유)
+
+    저장소의 version()이 바뀌었거나(다른 프로세스의 쓰기) 이 캐시를 거쳐 저장/삭제하면 무효화됩니다.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}        # {사용자: (version, 데이터, 주차 인덱스)}
+        self._generation = {}   # {사용자: 이 캐시를 거친 쓰기 횟수}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _copy(data):
+        # 호출한 쪽이 주차 데이터를 수정해도 캐시가 바뀌지 않도록 {주차: {요일: {start, end}}} 구조를 복사
+        return {
+            week: {day: dict(times) if isinstance(times, dict) else times for day, times in days.items()}
+            for week, days in data.items()
+        }
+
+    def _load_cached(self, username):
+        version = self.storage.version(username)
+        with self._lock:
+            entry = self._cache.get(username)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                profiler.count("cache_hit")
+                return entry
+            self.misses += 1
+            profiler.count("cache_miss")
+            generation = self._generation.get(username, 0)
+
+        data = self.storage.load(username)
+        entry = (version, data, WeekIndex(data.keys()))
+        with self._lock:
+            # 읽는 동안 이 캐시를 거친 쓰기가 있었다면 오래된 데이터를 캐시하지 않음
+            if self._generation.get(username, 0) == generation:
+                self._cache[username] = entry
+        return entry
+
+    def _invalidate(self, username):
+        with self._lock:
+            self._cache.pop(username, None)
+            self._generation[username] = self._generation.get(username, 0) + 1
+
+    def load(self, username):
+        return self._copy(self._load_cached(username)[1])
+
+    def weeks(self, username):
+        return list(self._load_cached(username)[2].keys)
+
+    def week_index(self, username):
+        return self._load_cached(username)[2]
+
+    def version(self, username):
+        return self.storage.version(username)
+
+    def save(self, username, week_label, work_times):
+        try:
+            self.storage.save(username, week_label, work_times)
+        finally:
+            self._invalidate(username)
+
+    def delete(self, username, week_label):
+        try:
+            return self.storage.delete(username, week_label)
+        finally:
+            self._invalidate(username)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "users": len(self._cache)}
+
+
+def create_storage(data_dir, backend=None):
+    """
+    저장소 생성
+
+    Args:
+        data_dir (str): 데이터 디렉터리
+        backend (str): "sqlite"(기본값) 또는 "json". 생략하면 WORKTIME_STORAGE 환경 변수를 사용합니다.
+    """
+    backend = backend or os.environ.get("WORKTIME_STORAGE", "sqlite")
+    if backend == "json":
+        return JsonWorkTimeStorage(data_dir)
+    if backend == "sqlite":
+        storage = SqliteWorkTimeStorage(os.path.join(data_dir, "worktime.db"))
+        storage.migrate_from_json(data_dir)
+        storage.migrate_legacy_week_keys()
+        return storage
+    raise ValueError(f"지원하지 않는 저장소입니다: {backend}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+from rerun_profiler import profiler
+
+
+class WeeklySummaryIndex:
+    """
+    사용자별 주간 근무 분 요약 인덱스 (SQLite)
+
+    저장/삭제할 때마다 해당 (사용자, 주차) 한 행만 갱신하므로, 팀 현황은
+    원본 기록을 다시 읽지 않고 요약 테이블만 읽어서 만들 수 있습니다.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS weekly_summary (
+                    username TEXT NOT NULL,
+                    week TEXT NOT NULL,
+                    minutes INTEGER NOT NULL,
+                    PRIMARY KEY (username, week)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS weekly_summary_week ON weekly_summary (week)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def needs_rebuild(self):
+        """한 번도 원본 기록에서 요약을 만든 적이 없으면 True"""
+        with closing(self._connect()) as conn:
+            # 주차 키를 날짜 형식으로 바꾸기 전에 만든 요약은 다시 생성
+            return conn.execute("SELECT 1 FROM meta WHERE key = 'built_week_keys'").fetchone() is None
+
+    def update(self, username, week_label, minutes):
+        profiler.count("db_write")
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO weekly_summary (username, week, minutes) VALUES (?, ?, ?)
+                ON CONFLICT (username, week) DO UPDATE SET minutes = excluded.minutes
+                """,
+                (username, week_label, minutes),
+            )
+
+    def delete(self, username, week_label):
+        profiler.count("db_write")
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM weekly_summary WHERE username = ? AND week = ?", (username, week_label))
+
+    def load_all(self, start_key=None, end_key=None):
+        """
+        Args:
+            start_key (str): 이 주차 키 이상만 조회 (None이면 제한 없음)
+            end_key (str): 이 주차 키 이하만 조회 (None이면 제한 없음)
+
+        Returns:
+            dict: {사용자: {주차: 근무_분}} 형태 (주차 순서)
+        """
+        profiler.count("db_read")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """
+                SELECT username, week, minutes FROM weekly_summary
+                WHERE (? IS NULL OR week >= ?) AND (? IS NULL OR week <= ?)
+                ORDER BY week
+                """,
+                (start_key, start_key, end_key, end_key),
+            ).fetchall()
+        summary = {}
+        for username, week, minutes in rows:
+            summary.setdefault(username, {})[week] = minutes
+        return summary
+
+    def rebuild(self, storage, usernames, week_minutes, workers=8):
+        """
+        원본 기록에서 요약을 다시 생성 (사용자별 로드와 계산은 스레드 풀에서 병렬로 수행)
+
+        Args:
+            storage: load(username)를 제공하는 근무시간 저장소
+            usernames (list): 요약할 사용자 목록
+            week_minutes (callable): 한 주 데이터({요일: {start, end}})의 근무 분을 계산하는 함수
+            workers (int): 스레드 수
+
+        Returns:
+            int: 요약한 주차 수
+        """
+        def summarize(username):
+            data = storage.load(username)
+            return [(username, week, week_minutes(work_times)) for week, work_times in data.items()]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            rows = [row for user_rows in executor.map(summarize, usernames) for row in user_rows]
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM weekly_summary WHERE username = ?", [(username,) for username in usernames])
+            conn.executemany("INSERT INTO weekly_summary (username, week, minutes) VALUES (?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built_week_keys', CURRENT_TIMESTAMP)")
+        return len(rows)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주차 키
+
+근무 기록은 그 주 월요일 날짜("YYYY-MM-DD")를 키로 저장합니다. 문자열 정렬 순서가 곧 시간 순서이므로
+연도가 바뀌어도 모호하지 않고, 범위 조회("최근 12주", "이번 분기")는 키 비교만으로 처리합니다.
+예전 "8월 2주차" 형식 라벨은 legacy_label_to_week_key로 변환합니다.
+"""
+import re
+from datetime import date, datetime, timedelta
+
+WEEK_KEY_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+LEGACY_LABEL_PATTERN = re.compile(r"^\s*(\d{1,2})월\s*(\d{1,2})주차\s*$")
+
+
+def week_start(day):
+    """day가 속한 주의 월요일"""
+    if isinstance(day, datetime):
+        day = day.date()
+    return day - timedelta(days=day.weekday())
+
+
+def week_key(day):
+    """day가 속한 주의 키 ("YYYY-MM-DD", 월요일)"""
+    return week_start(day).isoformat()
+
+
+def is_week_key(value):
+    return bool(WEEK_KEY_PATTERN.match(value))
+
+
+def legacy_label_to_week_key(label, today=None):
+    """
+    예전 "M월 N주차" 라벨을 주차 키로 변환 (연도는 today 기준으로 미래가 아닌 가장 가까운 해로 추정)
+
+    Returns:
+        str: 주차 키 (라벨 형식이 아니면 None)
+    """
+    match = LEGACY_LABEL_PATTERN.match(label)
+    if not match:
+        return None
+    month, week_number = int(match.group(1)), int(match.group(2))
+    if not 1 <= month <= 12 or week_number < 1:
+        return None
+
+    today = today or date.today()
+    for year in (today.year, today.year - 1):
+        first_day = date(year, month, 1)
+        if month == 1 and first_day.isocalendar()[1] > 50:
+            # 1월 1일이 전년도 마지막 주에 속하면 예전 라벨은 ISO 주차 번호를 그대로 사용했음
+            try:
+                start = date.fromisocalendar(year, week_number, 1)
+            except ValueError:
+                return None
+        else:
+            start = week_start(first_day) + timedelta(weeks=week_number - 1)
+        if start <= week_start(today):
+            return start.isoformat()
+    return start.isoformat()
+
+
+def normalize_week_key(value, today=None):
+    """주차 키는 그대로, 예전 라벨은 주차 키로 변환 (둘 다 아니면 원래 값)"""
+    if is_week_key(value):
+        return value
+    return legacy_label_to_week_key(value, today) or value
+
+
+def format_week_label(key):
+    """화면 표시용 라벨 (예: "2025년 8월 11일 주 (8/11~8/15)")"""
+    if not is_week_key(key):
+        return key
+    start = date.fromisoformat(key)
+    end = start + timedelta(days=4)
+    return f"{start.year}년 {start.month}월 {start.day}일 주 ({start.month}/{start.day}~{end.month}/{end.day})"
+
+
+def quarter_range(day):
+    """day가 속한 분기의 (첫 주 키, 마지막 주 키)"""
+    first_month = (day.month - 1) // 3 * 3 + 1
+    first = date(day.year, first_month, 1)
+    last = date(day.year + (first_month + 3 > 12), (first_month + 2) % 12 + 1, 1) - timedelta(days=1)
+    return week_key(first), week_key(last)
+
+
+def last_weeks_range(n, today=None):
+    """오늘이 속한 주를 포함한 최근 n주의 (첫 주 키, 마지막 주 키)"""
+    end = week_start(today or date.today())
+    return (end - timedelta(weeks=n - 1)).isoformat(), end.isoformat()
+
+
+class WeekIndex:
+    """정렬된 주차 키 인덱스"""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def latest(self):
+        return self.keys[-1] if self.keys else None